@@ -1,4 +1,15 @@
 import argparse
+import mmap
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+UP = ord('(')
+DOWN = ord(')')
+DEFAULT_BLOCK_SIZE = 1 << 24  # 16 MiB per block
+DEFAULT_BUFFER_SIZE = 1 << 20  # 1 MiB per streamed read
 
 def compute_final_floor(instructions: str) -> int:
     """
@@ -39,16 +50,244 @@ def find_first_basement_position(instructions: str) -> int:
             return index + 1  # Convert 0-based index to 1-based
     return -1  # If never reaches the basement
 
+def _open_instruction_map(path: str):
+    """
+    Memory-maps an instruction file read-only.
+
+    Args:
+        path (str): Path to the instruction file.
+
+    Returns:
+        mmap.mmap | None: The mapped file, or None if the file is empty.
+    """
+    with open(path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return None
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+def _block_prefix(buffer, start: int, end: int) -> np.ndarray:
+    """
+    Computes the running floor (relative to the block start) over a byte range.
+
+    Args:
+        buffer: A bytes-like object (e.g. an mmap) holding the instructions.
+        start (int): Offset of the first byte of the block.
+        end (int): Offset one past the last byte of the block.
+
+    Returns:
+        np.ndarray: The cumulative floor change after each byte of the block.
+    """
+    block = np.frombuffer(buffer, dtype=np.uint8, count=end - start, offset=start)
+    steps = (block == UP).view(np.int8) - (block == DOWN).view(np.int8)
+    return np.cumsum(steps, dtype=np.int64)
+
+def _summarize_block(task: tuple) -> tuple:
+    """
+    Computes the floor change and lowest relative floor of one block.
+
+    Args:
+        task (tuple): (path, start, end) describing the block.
+
+    Returns:
+        tuple: (delta, min_prefix) where delta is the net floor change across
+               the block and min_prefix is the lowest floor reached relative
+               to the floor at the start of the block.
+    """
+    path, start, end = task
+    mapped = _open_instruction_map(path)
+    try:
+        prefix = _block_prefix(mapped, start, end)
+        return int(prefix[-1]), int(prefix.min())
+    finally:
+        mapped.close()
+
+def compute_final_floor_mmap(path: str, block_size: int = DEFAULT_BLOCK_SIZE) -> int:
+    """
+    Computes the final floor by memory-mapping the file and counting bytes.
+
+    Args:
+        path (str): Path to the instruction file.
+        block_size (int): Number of bytes counted per slice of the mapping.
+
+    Returns:
+        int: The final floor number.
+    """
+    mapped = _open_instruction_map(path)
+    if mapped is None:
+        return 0
+    floor = 0
+    with mapped:
+        for start in range(0, len(mapped), block_size):
+            chunk = mapped[start:start + block_size]
+            floor += chunk.count(b'(') - chunk.count(b')')
+    return floor
+
+def find_first_basement_position_mmap(path: str, block_size: int = DEFAULT_BLOCK_SIZE,
+                                      workers: int = 0) -> int:
+    """
+    Finds the first basement position using a blocked cumulative sum.
+
+    Each block is summarised by its net floor change and its lowest prefix.
+    Blocks whose lowest prefix cannot bring the running floor down to -1 are
+    skipped; only the block containing the crossing is scanned for the exact
+    position. Blocks are summarised in order and the search stops at the
+    first block that reaches the basement.
+
+    Args:
+        path (str): Path to the instruction file.
+        block_size (int): Number of bytes per block.
+        workers (int): Number of worker processes used to summarise blocks.
+                       0 summarises blocks in the current process.
+
+    Returns:
+        int: The 1-based position of the first character that causes Santa
+             to reach floor -1. Returns -1 if never reached.
+    """
+    size = os.path.getsize(path)
+    tasks = [(path, start, min(start + block_size, size))
+             for start in range(0, size, block_size)]
+
+    def locate(summaries) -> tuple:
+        floor = 0
+        for (_, start, end), (delta, min_prefix) in zip(tasks, summaries):
+            if floor + min_prefix <= -1:
+                return start, end, floor
+            floor += delta
+        return None
+
+    if workers:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # map() yields results in block order, so the scan can stop at the
+            # first crossing; cancel_futures drops blocks that have not started.
+            found = locate(pool.map(_summarize_block, tasks, chunksize=1))
+            pool.shutdown(wait=False, cancel_futures=True)
+    else:
+        found = locate(map(_summarize_block, tasks))
+
+    if found is None:
+        return -1
+
+    start, end, floor = found
+    mapped = _open_instruction_map(path)
+    with mapped:
+        prefix = _block_prefix(mapped, start, end)
+        offset = int(np.argmax(prefix + floor == -1))
+    return start + offset + 1  # Convert 0-based offset to 1-based
+
+def process_instruction_stream(stream, buffer_size: int = DEFAULT_BUFFER_SIZE,
+                               on_basement=None) -> tuple:
+    """
+    Computes both parts in a single pass over a binary stream.
+
+    The stream is consumed in fixed-size buffers, so memory use does not
+    depend on the length of the input.
+
+    Args:
+        stream: A binary file-like object (e.g. an open file or sys.stdin.buffer).
+        buffer_size (int): Number of bytes read per buffer.
+        on_basement (callable, optional): Called with the 1-based basement
+            position as soon as it is found, before the rest of the stream is read.
+
+    Returns:
+        tuple: (final_floor, basement_position) where basement_position is -1
+               if Santa never reaches the basement.
+    """
+    buffer = bytearray(buffer_size)
+    floor = 0
+    consumed = 0
+    basement_position = -1
+    while True:
+        length = stream.readinto(buffer)
+        if not length:
+            break
+        chunk = memoryview(buffer)[:length]
+        if basement_position == -1:
+            prefix = _block_prefix(chunk, 0, length)
+            hits = np.flatnonzero(prefix + floor == -1)
+            if hits.size:
+                basement_position = consumed + int(hits[0]) + 1
+                if on_basement is not None:
+                    on_basement(basement_position)
+            floor += int(prefix[-1])
+        else:
+            floor += buffer.count(b'(', 0, length) - buffer.count(b')', 0, length)
+        chunk.release()
+        consumed += length
+    return floor, basement_position
+
 def main():
     # Parse command-line arguments
     parser = argparse.ArgumentParser(description="Advent of Code 2015 - Day 1")
     parser.add_argument(
         'input_file',
         type=str,
-        help='Path to the input file containing the instructions'
+        help="Path to the input file containing the instructions ('-' for stdin with --stream)"
+    )
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Read the input in fixed-size buffers and solve both parts in one pass'
+    )
+    parser.add_argument(
+        '--buffer-size',
+        type=int,
+        default=DEFAULT_BUFFER_SIZE,
+        help=f'Bytes per read in streaming mode (default: {DEFAULT_BUFFER_SIZE})'
+    )
+    parser.add_argument(
+        '--mmap',
+        action='store_true',
+        help='Memory-map the input and use the blocked NumPy engine'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=0,
+        help='Worker processes for the blocked engine (default: 0, run in-process)'
+    )
+    parser.add_argument(
+        '--block-size',
+        type=int,
+        default=DEFAULT_BLOCK_SIZE,
+        help=f'Bytes per block for the blocked engine (default: {DEFAULT_BLOCK_SIZE})'
     )
     args = parser.parse_args()
 
+    if args.stream:
+        def report_basement(position):
+            print(f"Part 2: Santa enters the basement at position {position}", flush=True)
+
+        try:
+            if args.input_file == '-':
+                final_floor, basement_position = process_instruction_stream(
+                    sys.stdin.buffer, args.buffer_size, report_basement)
+            else:
+                with open(args.input_file, 'rb') as file:
+                    final_floor, basement_position = process_instruction_stream(
+                        file, args.buffer_size, report_basement)
+        except FileNotFoundError:
+            print(f"Input file not found: {args.input_file}")
+            return
+        if basement_position == -1:
+            print("Part 2: Santa never enters the basement")
+        print(f"Part 1: Santa ends up on floor {final_floor}")
+        return
+
+    if args.mmap:
+        try:
+            final_floor = compute_final_floor_mmap(args.input_file, args.block_size)
+            basement_position = find_first_basement_position_mmap(
+                args.input_file, args.block_size, args.workers)
+        except FileNotFoundError:
+            print(f"Input file not found: {args.input_file}")
+            return
+        print(f"Part 1: Santa ends up on floor {final_floor}")
+        if basement_position != -1:
+            print(f"Part 2: Santa enters the basement at position {basement_position}")
+        else:
+            print("Part 2: Santa never enters the basement")
+        return
+
     # Read the input file
     try:
         with open(args.input_file, 'r') as file:
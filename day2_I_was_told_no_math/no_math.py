@@ -1,4 +1,17 @@
 import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+SEPARATOR = ord('x')
+NEWLINE = ord('\n')
+CARRIAGE_RETURN = ord('\r')
+DEFAULT_SHARD_SIZE = 64 << 20  # 64 MiB of manifest parsed per shard
+
+# Turns separators and line endings into the whitespace np.fromstring splits on
+TO_SPACES = bytes.maketrans(b'x\r\n', b'   ')
 
 def compute_wrapping_paper(l: int, w: int, h: int) -> int:
     """
@@ -44,6 +57,228 @@ def compute_ribbon(l: int, w: int, h: int) -> int:
     
     return smallest_perimeter + volume
 
+def _parse_line(line: str) -> tuple:
+    """
+    Parses a single manifest line the same way main() always has.
+
+    Args:
+        line (str): A line such as "2x3x4".
+
+    Returns:
+        tuple: (l, w, h) as integers.
+
+    Raises:
+        ValueError: If the line is not three 'x'-separated integers.
+    """
+    l, w, h = map(int, line.strip().split('x'))
+    return l, w, h
+
+def _strict_lines(buffer: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """
+    Flags, without splitting lines, each line that is exactly "<digits>x<digits>x<digits>".
+
+    A carriage return is allowed at the end of a line, so CRLF manifests stay
+    on the bulk path. Per-line counts are summed with np.add.reduceat over
+    byte masks, so no per-byte integer arrays are built.
+
+    Args:
+        buffer (np.ndarray): The raw manifest as uint8.
+        starts (np.ndarray): Offset of the first byte of each line.
+        ends (np.ndarray): Offset one past the last byte of each line.
+
+    Returns:
+        np.ndarray: A boolean per line, True if it can be parsed in bulk.
+    """
+    separator = buffer == SEPARATOR
+    # Each reduceat segment runs to the next line start, which only adds the newline
+    separators = np.add.reduceat(separator, starts, dtype=np.int32)
+
+    digit = (buffer - np.uint8(ord('0'))) < 10
+    bad = digit | separator
+    bad |= buffer == NEWLINE
+    np.logical_not(bad, out=bad)
+
+    # Separators need a digit on both sides; carriage returns must end the line
+    bad[:-1] |= separator[:-1] & ~digit[1:]
+    bad[1:] |= separator[1:] & ~digit[:-1]
+    bad[[0, -1]] |= separator[[0, -1]]
+    del digit, separator
+    carriage_return = np.flatnonzero(buffer == CARRIAGE_RETURN)
+    bad[carriage_return] = False
+    inner = carriage_return[carriage_return < len(buffer) - 1]
+    bad[inner] = buffer[inner + 1] != NEWLINE
+
+    rejected = np.add.reduceat(bad, starts, dtype=np.int32)
+    return (separators == 2) & (rejected == 0) & (ends > starts)
+
+def parse_manifest(data: bytes) -> tuple:
+    """
+    Parses a whole manifest into three integer columns in one bulk pass.
+
+    Well-formed lines are converted to integers by a single NumPy parse of
+    the buffer. Only the lines that fail the strict check are handed to the
+    per-line parser, so that any line it still accepts is kept and the line
+    numbers of the rejected ones are recorded.
+
+    Args:
+        data (bytes): The raw contents of the manifest.
+
+    Returns:
+        tuple: (l, w, h, invalid) where l, w and h are int64 column views in
+               file order and invalid is a list of (line_number, line) pairs for
+               unparseable lines.
+    """
+    line_count = data.count(b'\n') + (1 if data and not data.endswith(b'\n') else 0)
+    if not line_count:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty.copy(), empty.copy(), []
+
+    buffer = np.frombuffer(data, dtype=np.uint8)
+    line_ends = np.flatnonzero(buffer == NEWLINE)
+    starts = np.concatenate(([0], line_ends + 1))[:line_count]
+    ends = np.append(line_ends, len(buffer))[:line_count]
+    del line_ends
+    strict = _strict_lines(buffer, starts, ends)
+
+    if strict.all():
+        dims = np.fromstring(data.translate(TO_SPACES), dtype=np.int64, sep=' ').reshape(-1, 3)
+        return dims[:, 0], dims[:, 1], dims[:, 2], []
+
+    # Keep only the bytes of strict lines, each up to the next line start
+    keep = np.repeat(strict, np.diff(np.append(starts, len(buffer))))
+    text = buffer[keep].tobytes().translate(TO_SPACES)
+    del keep
+    dims = np.zeros((line_count, 3), dtype=np.int64)
+    dims[strict] = np.fromstring(text, dtype=np.int64, sep=' ').reshape(-1, 3)
+    del text
+    parsed = strict.copy()
+    invalid = []
+    for index in np.flatnonzero(~strict):
+        line = data[starts[index]:ends[index]].decode(errors='replace')
+        try:
+            dims[index] = _parse_line(line)
+            parsed[index] = True
+        except ValueError:
+            invalid.append((int(index) + 1, line.strip()))
+
+    dims = dims[parsed]
+    return dims[:, 0], dims[:, 1], dims[:, 2], invalid
+
+def compute_totals(l: np.ndarray, w: np.ndarray, h: np.ndarray) -> tuple:
+    """
+    Computes the total wrapping paper and ribbon for columns of presents.
+
+    Args:
+        l (np.ndarray): Lengths of the presents.
+        w (np.ndarray): Widths of the presents.
+        h (np.ndarray): Heights of the presents.
+
+    Returns:
+        tuple: (total_paper, total_ribbon) as integers.
+    """
+    side1 = l * w
+    side2 = w * h
+    side3 = h * l
+    slack = np.minimum(np.minimum(side1, side2), side3)
+    paper = 2 * (side1 + side2 + side3) + slack
+
+    # The two smallest sides are everything except the largest one
+    largest = np.maximum(np.maximum(l, w), h)
+    ribbon = 2 * (l + w + h - largest) + l * w * h
+
+    return int(paper.sum()), int(ribbon.sum())
+
+def split_shards(path: str, shard_count: int) -> list:
+    """
+    Splits a manifest file into byte ranges that start and end on line boundaries.
+
+    Args:
+        path (str): Path to the manifest file.
+        shard_count (int): Desired number of shards.
+
+    Returns:
+        list: (start, end) byte offsets; fewer than shard_count ranges are
+              returned when the file has too few lines to split further.
+    """
+    size = os.path.getsize(path)
+    boundaries = [0]
+    with open(path, 'rb') as file:
+        for index in range(1, shard_count):
+            target = max(size * index // shard_count, boundaries[-1])
+            if target >= size:
+                break
+            file.seek(target)
+            file.readline()  # Advance to the start of the next line
+            offset = file.tell()
+            if offset >= size:
+                break
+            if offset > boundaries[-1]:
+                boundaries.append(offset)
+    boundaries.append(size)
+    return [(start, end) for start, end in zip(boundaries, boundaries[1:]) if end > start]
+
+def process_shard(task: tuple) -> dict:
+    """
+    Parses one shard of a manifest and sums its paper and ribbon totals.
+
+    Args:
+        task (tuple): (path, start, end) describing the shard.
+
+    Returns:
+        dict: Totals and statistics for the shard: 'start', 'end', 'paper',
+              'ribbon', 'lines', 'invalid' (list of (line_number, line) pairs
+              numbered from the start of the shard) and 'elapsed' in seconds.
+    """
+    path, start, end = task
+    began = time.perf_counter()
+    with open(path, 'rb') as file:
+        file.seek(start)
+        data = file.read(end - start)
+    l, w, h, invalid = parse_manifest(data)
+    paper, ribbon = compute_totals(l, w, h)
+    return {
+        'start': start,
+        'end': end,
+        'paper': paper,
+        'ribbon': ribbon,
+        'lines': data.count(b'\n') + (1 if data and not data.endswith(b'\n') else 0),
+        'invalid': invalid,
+        'elapsed': time.perf_counter() - began,
+    }
+
+def compute_totals_sharded(path: str, workers: int, shard_size: int = DEFAULT_SHARD_SIZE) -> tuple:
+    """
+    Computes manifest totals by summing newline-aligned shards in a process pool.
+
+    Shards have a fixed size rather than one per worker, so each worker's
+    memory stays bounded however large the manifest grows.
+
+    Args:
+        path (str): Path to the manifest file.
+        workers (int): Number of worker processes.
+        shard_size (int): Approximate number of bytes per shard.
+
+    Returns:
+        tuple: (total_paper, total_ribbon, invalid, shards) where invalid holds
+               (line_number, line) pairs numbered across the whole file and
+               shards is the list of per-shard statistics from process_shard.
+    """
+    ranges = split_shards(path, max(1, -(-os.path.getsize(path) // shard_size)))
+    tasks = [(path, start, end) for start, end in ranges]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        shards = list(pool.map(process_shard, tasks))
+
+    total_paper = 0
+    total_ribbon = 0
+    invalid = []
+    lines_before = 0
+    for shard in shards:
+        total_paper += shard['paper']
+        total_ribbon += shard['ribbon']
+        invalid.extend((lines_before + line_number, line) for line_number, line in shard['invalid'])
+        lines_before += shard['lines']
+    return total_paper, total_ribbon, invalid, shards
+
 def main():
     # Parse command-line arguments
     parser = argparse.ArgumentParser(description="Advent of Code 2015 - Day 2")
@@ -52,8 +287,64 @@ def main():
         type=str,
         help='Path to the input file containing the dimensions of the presents'
     )
+    parser.add_argument(
+        '--batch',
+        action='store_true',
+        help='Parse the manifest into columns and compute totals vectorized'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=0,
+        help='Split the manifest into shards summed by this many processes (default: 0, off)'
+    )
+    parser.add_argument(
+        '--shard-size',
+        type=int,
+        default=DEFAULT_SHARD_SIZE,
+        help=f'Approximate bytes per shard with --workers (default: {DEFAULT_SHARD_SIZE})'
+    )
     args = parser.parse_args()
 
+    if args.shard_size < 1:
+        parser.error("--shard-size must be positive")
+
+    if args.workers:
+        try:
+            total_paper, total_ribbon, invalid, shards = compute_totals_sharded(
+                args.input_file, args.workers, args.shard_size)
+        except FileNotFoundError:
+            print(f"Input file not found: {args.input_file}")
+            return
+
+        for line_number, line in invalid:
+            print(f"Invalid line format on line {line_number}: {line}")
+
+        for index, shard in enumerate(shards):
+            print(f"Shard {index}: bytes {shard['start']}-{shard['end']}, "
+                  f"{shard['lines']} lines, {len(shard['invalid'])} invalid, "
+                  f"{shard['elapsed']:.3f}s")
+
+        print(f"Part 1: Total wrapping paper required: {total_paper} square feet")
+        print(f"Part 2: Total ribbon required: {total_ribbon} feet")
+        return
+
+    if args.batch:
+        try:
+            with open(args.input_file, 'rb') as file:
+                l, w, h, invalid = parse_manifest(file.read())
+        except FileNotFoundError:
+            print(f"Input file not found: {args.input_file}")
+            return
+
+        for line_number, line in invalid:
+            print(f"Invalid line format on line {line_number}: {line}")
+
+        total_paper, total_ribbon = compute_totals(l, w, h)
+        print(f"Part 1: Total wrapping paper required: {total_paper} square feet")
+        print(f"Part 2: Total ribbon required: {total_ribbon} feet")
+        return
+
     try:
         with open(args.input_file, 'r') as file:
             dimensions = file.readlines()
@@ -1,57 +1,213 @@
 import argparse
+from concurrent.futures import ProcessPoolExecutor
 
-def count_unique_houses_with_robo_santa(directions: str) -> int:
+import numpy as np
+
+DEFAULT_CHUNK_SIZE = 1 << 24  # Moves processed per vectorized step
+COORDINATE_BIAS = 1 << 31  # Shifts signed coordinates into unsigned 32-bit range
+
+# (dx, dy) for each direction; any other character is a turn with no movement
+MOVES = {'^': (0, 1), 'v': (0, -1), '>': (1, 0), '<': (-1, 0)}
+
+# Per-byte x and y steps for each direction character; other bytes do not move
+STEP_X = np.zeros(256, dtype=np.int64)
+STEP_Y = np.zeros(256, dtype=np.int64)
+STEP_X[ord('>')], STEP_X[ord('<')] = 1, -1
+STEP_Y[ord('^')], STEP_Y[ord('v')] = 1, -1
+
+def count_unique_houses(directions: str, couriers: int = 1) -> int:
     """
-    Counts the number of unique houses visited by Santa and Robo-Santa.
-    
+    Counts the number of unique houses visited by couriers taking turns.
+
     Args:
         directions (str): A string of directions (^, v, >, <).
-        
+        couriers (int): Number of couriers; move i belongs to courier i % couriers.
+
     Returns:
         int: Number of unique houses visited.
+
+    Raises:
+        ValueError: If couriers is less than 1.
     """
-    # Starting positions
-    santa_x, santa_y = 0, 0
-    robo_x, robo_y = 0, 0
-    visited = set()
-    visited.add((0, 0))  # Add starting location
+    if couriers < 1:
+        raise ValueError(f"Need at least one courier, got {couriers}")
+
+    # Every courier starts at the same location
+    positions = [(0, 0)] * couriers
+    visited = {(0, 0)}
 
-    # Process each direction
     for i, move in enumerate(directions):
-        # Determine who is moving
-        if i % 2 == 0:  # Santa's turn
-            if move == '^':
-                santa_y += 1
-            elif move == 'v':
-                santa_y -= 1
-            elif move == '>':
-                santa_x += 1
-            elif move == '<':
-                santa_x -= 1
-            visited.add((santa_x, santa_y))
-        else:  # Robo-Santa's turn
-            if move == '^':
-                robo_y += 1
-            elif move == 'v':
-                robo_y -= 1
-            elif move == '>':
-                robo_x += 1
-            elif move == '<':
-                robo_x -= 1
-            visited.add((robo_x, robo_y))
+        courier = i % couriers
+        x, y = positions[courier]
+        dx, dy = MOVES.get(move, (0, 0))
+        positions[courier] = (x + dx, y + dy)
+        visited.add(positions[courier])
 
     return len(visited)
 
+def count_unique_houses_with_robo_santa(directions: str) -> int:
+    """
+    Counts the number of unique houses visited by Santa and Robo-Santa.
+
+    Args:
+        directions (str): A string of directions (^, v, >, <).
+
+    Returns:
+        int: Number of unique houses visited.
+    """
+    return count_unique_houses(directions, couriers=2)
+
+def pack_coordinates(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """
+    Packs house coordinates into single 64-bit keys.
+
+    Args:
+        x (np.ndarray): X coordinates, each within the signed 32-bit range.
+        y (np.ndarray): Y coordinates, each within the signed 32-bit range.
+
+    Returns:
+        np.ndarray: uint64 keys with x in the high word and y in the low word.
+    """
+    high = (x + COORDINATE_BIAS).astype(np.uint64) << np.uint64(32)
+    return high | (y + COORDINATE_BIAS).astype(np.uint64)
+
+def walk_courier(moves: bytes, chunk_size: int = DEFAULT_CHUNK_SIZE) -> np.ndarray:
+    """
+    Walks a single courier's moves and returns the houses it visits.
+
+    Each chunk of moves is turned into positions with a cumulative sum,
+    packed, and merged into a sorted array of unique keys, so memory is
+    bounded by the chunk size plus 8 bytes per unique house.
+
+    Args:
+        moves (bytes): This courier's own moves, in order, as raw bytes.
+        chunk_size (int): Number of moves handled per step.
+
+    Returns:
+        np.ndarray: Sorted unique uint64 keys of the houses visited, including
+                    the starting house.
+    """
+    steps = np.frombuffer(moves, dtype=np.uint8)
+    x0 = y0 = 0
+    visited = pack_coordinates(np.zeros(1, dtype=np.int64), np.zeros(1, dtype=np.int64))
+
+    for start in range(0, len(steps), chunk_size):
+        chunk = steps[start:start + chunk_size]
+        x = np.cumsum(STEP_X[chunk]) + x0
+        y = np.cumsum(STEP_Y[chunk]) + y0
+        x0, y0 = int(x[-1]), int(y[-1])
+        visited = np.union1d(visited, pack_coordinates(x, y))
+
+    return visited
+
+def _walk_courier_task(task: tuple) -> np.ndarray:
+    """
+    Unpacks a (moves, chunk_size) pair for walk_courier in a worker process.
+    """
+    moves, chunk_size = task
+    return walk_courier(moves, chunk_size)
+
+def simulate_couriers(directions: bytes, couriers: int = 1, workers: int = 0,
+                      chunk_size: int = DEFAULT_CHUNK_SIZE) -> dict:
+    """
+    Simulates couriers taking turns and merges their visited houses.
+
+    Courier k makes moves k, k + couriers, k + 2 * couriers, ..., so each
+    courier's sub-stream is walked independently, optionally in parallel.
+
+    Args:
+        directions (bytes): The directions (^, v, >, <) as raw bytes.
+        couriers (int): Number of couriers taking turns round-robin.
+        workers (int): Number of worker processes; 0 walks in-process.
+        chunk_size (int): Number of moves handled per vectorized step.
+
+    Returns:
+        dict: 'unique' is the number of unique houses visited overall and
+              'couriers' lists, per courier, the houses it 'visited' and how
+              many of those are 'shared' with at least one other courier.
+
+    Raises:
+        ValueError: If couriers is less than 1.
+    """
+    if couriers < 1:
+        raise ValueError(f"Need at least one courier, got {couriers}")
+
+    tasks = [(directions[courier::couriers], chunk_size) for courier in range(couriers)]
+    if workers:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            visits = list(pool.map(_walk_courier_task, tasks))
+    else:
+        visits = [_walk_courier_task(task) for task in tasks]
+
+    houses, visitor_counts = np.unique(np.concatenate(visits), return_counts=True)
+    shared_houses = houses[visitor_counts > 1]
+    stats = [
+        {'visited': len(visited), 'shared': int(np.isin(visited, shared_houses).sum())}
+        for visited in visits
+    ]
+    return {'unique': len(houses), 'couriers': stats}
+
+def count_unique_houses_compact(directions: bytes, couriers: int = 2, workers: int = 0,
+                                chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """
+    Counts unique houses using packed 64-bit coordinates instead of tuples.
+
+    Args:
+        directions (bytes): The directions (^, v, >, <) as raw bytes.
+        couriers (int): Number of couriers taking turns (2 for Santa and Robo-Santa).
+        workers (int): Number of worker processes; 0 walks in-process.
+        chunk_size (int): Number of moves handled per vectorized step.
+
+    Returns:
+        int: Number of unique houses visited.
+    """
+    return simulate_couriers(directions, couriers, workers, chunk_size)['unique']
+
 def main():
     # Parse command-line arguments
-    parser = argparse.ArgumentParser(description="Advent of Code 2015 - Day 3, Part 2")
+    parser = argparse.ArgumentParser(description="Advent of Code 2015 - Day 3")
     parser.add_argument(
         'input_file',
         type=str,
         help='Path to the input file containing Santa\'s directions'
     )
+    parser.add_argument(
+        '--couriers',
+        type=int,
+        default=2,
+        help='Number of couriers taking turns (1 for part 1, default: 2 for part 2)'
+    )
+    parser.add_argument(
+        '--compact',
+        action='store_true',
+        help='Use the packed 64-bit coordinate index instead of a set of tuples'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=0,
+        help='Worker processes for the compact engine (default: 0, run in-process)'
+    )
     args = parser.parse_args()
 
+    if args.couriers < 1:
+        parser.error("--couriers must be at least 1")
+
+    if args.compact:
+        try:
+            with open(args.input_file, 'rb') as file:
+                directions = file.read().strip()
+        except FileNotFoundError:
+            print(f"Input file not found: {args.input_file}")
+            return
+
+        result = simulate_couriers(directions, args.couriers, args.workers)
+        for courier, stats in enumerate(result['couriers']):
+            print(f"Courier {courier}: {stats['visited']} houses, "
+                  f"{stats['shared']} shared with other couriers")
+        print(f"Total unique houses visited: {result['unique']}")
+        return
+
     try:
         with open(args.input_file, 'r') as file:
             directions = file.read().strip()
@@ -59,7 +215,7 @@ def main():
         print(f"Input file not found: {args.input_file}")
         return
 
-    unique_houses = count_unique_houses_with_robo_santa(directions)
+    unique_houses = count_unique_houses(directions, args.couriers)
     print(f"Total unique houses visited: {unique_houses}")
 
 if __name__ == "__main__":
@@ -1,4 +1,21 @@
+import argparse
 import hashlib
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+DEFAULT_BLOCK_SIZE = 100_000  # Nonces searched per task in the parallel miner
+DEFAULT_CHECKPOINT_INTERVAL = 30.0  # Seconds between state file writes in batch mode
+NO_RESULT = 2 ** 62  # Sentinel for "no valid nonce found yet"
+SUFFIX_DIGITS = 3  # Low digits of each nonce taken from a precomputed table
+
+# Zero-padded ASCII suffixes b"000" .. b"999" appended to a shared high-digit prefix
+SUFFIXES = [str(low).zfill(SUFFIX_DIGITS).encode() for low in range(10 ** SUFFIX_DIGITS)]
+
+# Lowest valid nonce found by any worker, shared through the pool initializer
+_shared_best = None
 
 def find_lowest_number(secret_key: str, prefix: str = "000000") -> int:
     """
@@ -23,10 +40,572 @@ def find_lowest_number(secret_key: str, prefix: str = "000000") -> int:
             return number
         number += 1
 
+def compile_prefix(prefix: str) -> tuple:
+    """
+    Converts a hex prefix into a check on raw MD5 digest bytes.
+
+    Args:
+        prefix (str): The required hex prefix, of odd or even length.
+
+    Returns:
+        tuple: (whole_bytes, index, mask, value): a digest matches when it
+               starts with whole_bytes and digest[index] & mask == value. For
+               even-length prefixes mask is 0, so the second test always passes.
+
+    Raises:
+        ValueError: If the prefix is not lowercase hex or is longer than a digest.
+    """
+    if len(prefix) > 32 or any(char not in '0123456789abcdef' for char in prefix):
+        raise ValueError(f"Prefix must be at most 32 lowercase hex digits: {prefix!r}")
+    whole = len(prefix) // 2
+    if len(prefix) % 2:
+        return bytes.fromhex(prefix[:-1]), whole, 0xF0, int(prefix[-1], 16) << 4
+    return bytes.fromhex(prefix), min(whole, 15), 0, 0
+
+def search_range(secret_key: str, prefix: str, start: int, end: int,
+                 should_stop=None) -> tuple:
+    """
+    Searches the nonces in [start, end) with a reused MD5 state.
+
+    The secret key is hashed once and its state copied for each nonce. For
+    each run of 1000 nonces, the high digits are also hashed once and only
+    a precomputed three-digit suffix is fed per nonce. Digests are matched
+    as raw bytes, so no hex conversion or string formatting happens in the
+    inner loop.
+
+    Args:
+        secret_key (str): The secret key.
+        prefix (str): The required hex prefix.
+        start (int): First nonce to try.
+        end (int): One past the last nonce to try.
+        should_stop (callable, optional): Polled once per 1000 nonces; the
+            search returns early when it returns True.
+
+    Returns:
+        tuple: (nonce, hashes) where nonce is the first valid nonce in the
+               range or None, and hashes is the number of hashes computed.
+    """
+    whole, index, mask, value = compile_prefix(prefix)
+    key_state = hashlib.md5(secret_key.encode())
+    group = 10 ** SUFFIX_DIGITS
+    start = max(start, 1)
+    hashes = 0
+
+    # Nonces below 1000 have no high digits, so their suffixes are not padded
+    for number in range(start, min(end, group)):
+        state = key_state.copy()
+        state.update(str(number).encode())
+        digest = state.digest()
+        hashes += 1
+        if digest.startswith(whole) and digest[index] & mask == value:
+            return number, hashes
+
+    for high in range(max(start, group) // group, -(-end // group)):
+        if should_stop is not None and should_stop():
+            return None, hashes
+        high_state = key_state.copy()
+        high_state.update(str(high).encode())
+        base = high * group
+        for suffix in SUFFIXES[max(start - base, 0):min(end - base, group)]:
+            state = high_state.copy()
+            state.update(suffix)
+            digest = state.digest()
+            hashes += 1
+            if digest.startswith(whole) and digest[index] & mask == value:
+                return base + int(suffix), hashes
+    return None, hashes
+
+def find_lowest_number_fast(secret_key: str, prefix: str = "000000") -> int:
+    """
+    Finds the lowest valid nonce with the digest-level inner loop.
+
+    Args:
+        secret_key (str): The secret key.
+        prefix (str): The required hex prefix.
+
+    Returns:
+        int: The lowest positive number that produces a valid hash.
+    """
+    start = 1
+    while True:
+        nonce, _ = search_range(secret_key, prefix, start, start + DEFAULT_BLOCK_SIZE)
+        if nonce is not None:
+            return nonce
+        start += DEFAULT_BLOCK_SIZE
+
+def _first_byte_table(checks: dict) -> list:
+    """
+    Indexes compiled prefix checks by the digest first bytes they can match.
+
+    Args:
+        checks (dict): Maps each target to its compile_prefix tuple.
+
+    Returns:
+        list: 256 tuples of (target, whole, index, mask, value); entry b holds
+              the checks a digest starting with byte b could still pass.
+    """
+    table = [()] * 256
+    for target, (whole, index, mask, value) in checks.items():
+        if whole:
+            first_bytes = [whole[0]]
+        else:
+            first_bytes = [byte for byte in range(256) if byte & mask == value]
+        for byte in first_bytes:
+            table[byte] += ((target, whole, index, mask, value),)
+    return table
+
+def search_range_targets(secret_key: str, checks: dict, start: int, end: int) -> tuple:
+    """
+    Searches the nonces in [start, end) for the first match of every check.
+
+    Uses the same MD5 state reuse as search_range, but each digest is tested
+    against all remaining checks at once: a table keyed on the first digest
+    byte rejects almost every digest with one lookup, whether or not the
+    targets share a prefix. Every nonce is hashed exactly once.
+
+    Args:
+        secret_key (str): The secret key.
+        checks (dict): Maps each target to its compile_prefix tuple.
+        start (int): First nonce to try.
+        end (int): One past the last nonce to try.
+
+    Returns:
+        tuple: (found, hashes) where found maps each target matched in the
+               range to its first valid nonce, and hashes is the number of
+               hashes computed. The search ends once every target is found.
+    """
+    remaining = dict(checks)
+    table = _first_byte_table(remaining)
+    found = {}
+
+    def record(digest: bytes, number: int) -> bool:
+        """Records the checks this digest passes; returns True if any did."""
+        matched = False
+        for target, whole, index, mask, value in table[digest[0]]:
+            if digest.startswith(whole) and digest[index] & mask == value:
+                found[target] = number
+                del remaining[target]
+                matched = True
+        return matched
+
+    key_state = hashlib.md5(secret_key.encode())
+    group = 10 ** SUFFIX_DIGITS
+    start = max(start, 1)
+    hashes = 0
+
+    # Nonces below 1000 have no high digits, so their suffixes are not padded
+    for number in range(start, min(end, group)):
+        state = key_state.copy()
+        state.update(str(number).encode())
+        digest = state.digest()
+        hashes += 1
+        if table[digest[0]] and record(digest, number):
+            if not remaining:
+                return found, hashes
+            table = _first_byte_table(remaining)
+
+    for high in range(max(start, group) // group, -(-end // group)):
+        high_state = key_state.copy()
+        high_state.update(str(high).encode())
+        base = high * group
+        for suffix in SUFFIXES[max(start - base, 0):min(end - base, group)]:
+            state = high_state.copy()
+            state.update(suffix)
+            digest = state.digest()
+            hashes += 1
+            if table[digest[0]] and record(digest, base + int(suffix)):
+                if not remaining:
+                    return found, hashes
+                table = _first_byte_table(remaining)
+    return found, hashes
+
+def find_lowest_numbers(secret_key: str, prefixes) -> dict:
+    """
+    Finds the lowest valid nonce for several prefixes in a single sweep.
+
+    Each nonce is hashed once and its digest checked against every target
+    not yet satisfied, so the sweep costs the same as a search for the
+    hardest target alone. It ends as soon as the last target is satisfied.
+
+    Args:
+        secret_key (str): The secret key.
+        prefixes: The required hex prefixes, e.g. {"00000", "000000"}.
+
+    Returns:
+        dict: The lowest valid nonce for each prefix.
+    """
+    targets = {prefix: compile_prefix(prefix) for prefix in prefixes}
+    results = {}
+    start = 1
+    while targets:
+        end = start + DEFAULT_BLOCK_SIZE
+        found, _ = search_range_targets(secret_key, targets, start, end)
+        for prefix, nonce in found.items():
+            results[prefix] = nonce
+            del targets[prefix]
+        start = end
+    return results
+
+def benchmark(secret_key: str, prefix: str = "000000", count: int = 1_000_000) -> dict:
+    """
+    Measures hashes per second of find_lowest_number's loop and search_range.
+
+    Both loops run over the same count nonces; the prefix is only relevant
+    for the digest comparison, so a valid nonce may end a run early.
+
+    Args:
+        secret_key (str): The secret key.
+        prefix (str): The required hex prefix.
+        count (int): Number of nonces to hash with each implementation.
+
+    Returns:
+        dict: 'baseline' and 'fast' rates in hashes per second, and 'speedup'.
+    """
+    began = time.perf_counter()
+    baseline_hashes = 0
+    for number in range(1, count + 1):
+        test_input = f"{secret_key}{number}"
+        baseline_hashes += 1
+        if hashlib.md5(test_input.encode()).hexdigest().startswith(prefix):
+            break
+    baseline = baseline_hashes / (time.perf_counter() - began)
+
+    began = time.perf_counter()
+    _, fast_hashes = search_range(secret_key, prefix, 1, count + 1)
+    fast = fast_hashes / (time.perf_counter() - began)
+
+    return {'baseline': baseline, 'fast': fast, 'speedup': fast / baseline}
+
+def _init_worker(shared_best) -> None:
+    """
+    Stores the shared best-nonce value in a worker process.
+    """
+    global _shared_best
+    _shared_best = shared_best
+
+def _mine_block(secret_key: str, prefix: str, start: int, end: int) -> tuple:
+    """
+    Searches the nonces in [start, end) for the first valid one.
+
+    In the parallel miner, the search gives up early once another worker has
+    published a valid nonce lower than start, since nothing in this block
+    can beat it.
+
+    Args:
+        secret_key (str): The secret key.
+        prefix (str): The required prefix for the hash.
+        start (int): First nonce of the block.
+        end (int): One past the last nonce of the block.
+
+    Returns:
+        tuple: (nonce, hashes, elapsed, pid) where nonce is the first valid
+               nonce in the block or None, hashes is the number of hashes
+               computed, elapsed is in seconds and pid identifies the worker.
+    """
+    began = time.perf_counter()
+    should_stop = None
+    if _shared_best is not None:
+        should_stop = lambda: _shared_best.value < start
+    nonce, hashes = search_range(secret_key, prefix, start, end, should_stop)
+    return nonce, hashes, time.perf_counter() - began, os.getpid()
+
+def find_lowest_number_parallel(secret_key: str, prefix: str = "000000", workers: int = None,
+                                block_size: int = DEFAULT_BLOCK_SIZE) -> tuple:
+    """
+    Finds the lowest valid nonce by mining consecutive blocks in a process pool.
+
+    Blocks are handed out in increasing order. When a worker finds a valid
+    nonce it is published as the shared best; blocks starting above it are
+    cancelled (or abandoned if already running), while blocks below it keep
+    going because they may still hold a lower nonce.
+
+    Args:
+        secret_key (str): The secret key.
+        prefix (str): The required prefix for the hash.
+        workers (int, optional): Number of worker processes (default: CPU count).
+        block_size (int): Number of nonces per block.
+
+    Returns:
+        tuple: (nonce, stats) where stats maps each worker pid to a dict of
+               'hashes', 'seconds' and 'rate' (hashes per second).
+    """
+    compile_prefix(prefix)  # Reject invalid prefixes before starting workers
+    workers = workers or os.cpu_count() or 1
+    shared_best = multiprocessing.Value('q', NO_RESULT)
+    stats = {}
+    next_start = 1
+    pending = set()
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(shared_best,)) as pool:
+        while True:
+            # Keep every worker busy with blocks that could still beat the best
+            while len(pending) < 2 * workers and next_start < shared_best.value:
+                pending.add(pool.submit(_mine_block, secret_key, prefix,
+                                        next_start, next_start + block_size))
+                next_start += block_size
+            if not pending:
+                break
+
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                nonce, hashes, elapsed, pid = future.result()
+                worker = stats.setdefault(pid, {'hashes': 0, 'seconds': 0.0})
+                worker['hashes'] += hashes
+                worker['seconds'] += elapsed
+                if nonce is not None and nonce < shared_best.value:
+                    shared_best.value = nonce
+
+    for worker in stats.values():
+        worker['rate'] = worker['hashes'] / worker['seconds'] if worker['seconds'] else 0.0
+    return shared_best.value, stats
+
+def load_checkpoint(path: str) -> dict:
+    """
+    Loads batch mining state, or returns an empty state if there is none yet.
+
+    Args:
+        path (str): Path to the JSON state file.
+
+    Returns:
+        dict: Maps each prefix to {secret_key: {'searched': n, 'nonce': n or None}},
+              where 'searched' is the last nonce fully searched.
+    """
+    try:
+        with open(path, 'r') as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {}
+
+def save_checkpoint(path: str, state: dict) -> None:
+    """
+    Atomically writes batch mining state, so a kill mid-write cannot corrupt it.
+
+    Args:
+        path (str): Path to the JSON state file.
+        state (dict): State as returned by load_checkpoint.
+    """
+    temporary = f"{path}.tmp"
+    with open(temporary, 'w') as file:
+        json.dump(state, file, indent=2, sort_keys=True)
+    os.replace(temporary, path)
+
+def mine_keys(secret_keys: list, prefix: str, state_path: str, workers: int = None,
+              block_size: int = DEFAULT_BLOCK_SIZE,
+              checkpoint_interval: float = DEFAULT_CHECKPOINT_INTERVAL) -> dict:
+    """
+    Mines many secret keys concurrently, resuming from and saving checkpoints.
+
+    About two blocks per worker are kept in flight, spread over the keys
+    that are still unsolved, so even a single key keeps every worker busy.
+    Blocks may finish out of order: the checkpoint records, per key, the
+    highest nonce below which every block has completed, and a found nonce
+    is only confirmed once every block below it has completed. The state
+    file is rewritten every checkpoint_interval seconds and when the job
+    finishes.
+
+    Args:
+        secret_keys (list): The secret keys to mine.
+        prefix (str): The required hex prefix.
+        state_path (str): Path to the JSON state file.
+        workers (int, optional): Number of worker processes (default: CPU count).
+        block_size (int): Number of nonces per block.
+        checkpoint_interval (float): Seconds between checkpoint writes.
+
+    Returns:
+        dict: The lowest valid nonce for each secret key.
+    """
+    compile_prefix(prefix)  # Reject invalid prefixes before starting workers
+    workers = workers or os.cpu_count() or 1
+    state = load_checkpoint(state_path)
+    progress = state.setdefault(prefix, {})
+    for secret_key in secret_keys:
+        progress.setdefault(secret_key, {'searched': 0, 'nonce': None})
+    # Hashes per key, and the wall-clock span over which its blocks ran in this
+    # run, so the rate counts every worker mining the key at once
+    throughput = {secret_key: {'hashes': 0, 'started': None, 'stopped': None}
+                  for secret_key in secret_keys}
+
+    # Per unsolved key: next block start, finished blocks above the checkpoint
+    # (start -> last nonce searched), lowest nonce found and blocks in flight
+    searches = {
+        secret_key: {'next': progress[secret_key]['searched'] + 1, 'finished': {},
+                     'best': NO_RESULT, 'in_flight': 0}
+        for secret_key in secret_keys if progress[secret_key]['nonce'] is None
+    }
+
+    def report() -> None:
+        for secret_key in secret_keys:
+            entry = progress[secret_key]
+            mined = throughput[secret_key]
+            seconds = 0.0
+            if mined['started'] is not None:
+                seconds = (mined['stopped'] or time.monotonic()) - mined['started']
+            rate = mined['hashes'] / seconds if seconds else 0.0
+            status = f"found {entry['nonce']}" if entry['nonce'] is not None \
+                else f"searched to {entry['searched']}"
+            print(f"{secret_key}: {status}, {rate:,.0f} hashes/sec", flush=True)
+
+    def finish_block(secret_key, start, last) -> None:
+        """Records [start, last] as searched and advances the key's checkpoint."""
+        search = searches[secret_key]
+        search['finished'][start] = last
+        entry = progress[secret_key]
+        while entry['searched'] + 1 in search['finished']:
+            entry['searched'] = search['finished'].pop(entry['searched'] + 1)
+        if entry['searched'] >= search['best']:
+            entry['searched'] = entry['nonce'] = search['best']
+            throughput[secret_key]['stopped'] = time.monotonic()
+            del searches[secret_key]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = {}
+
+        def fill() -> None:
+            """Tops the pool up to two blocks per worker, favouring keys with the fewest."""
+            while len(in_flight) < 2 * workers:
+                open_keys = [secret_key for secret_key, search in searches.items()
+                             if search['next'] < search['best']]
+                if not open_keys:
+                    return
+                secret_key = min(open_keys, key=lambda key: searches[key]['in_flight'])
+                search = searches[secret_key]
+                start = search['next']
+                end = min(start + block_size, search['best'])
+                future = pool.submit(_mine_block, secret_key, prefix, start, end)
+                in_flight[future] = (secret_key, start, end - 1)
+                search['next'] = end
+                search['in_flight'] += 1
+                if throughput[secret_key]['started'] is None:
+                    throughput[secret_key]['started'] = time.monotonic()
+
+        fill()
+        last_checkpoint = time.monotonic()
+        try:
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    secret_key, start, last = in_flight.pop(future)
+                    if future.cancelled() or secret_key not in searches:
+                        continue
+                    search = searches[secret_key]
+                    search['in_flight'] -= 1
+                    nonce, hashes, _, _ = future.result()
+                    throughput[secret_key]['hashes'] += hashes
+                    if nonce is not None:
+                        last = nonce
+                        if nonce < search['best']:
+                            search['best'] = nonce
+                            # Blocks above the new best can no longer matter
+                            for other, (other_key, other_start, _) in list(in_flight.items()):
+                                if other_key == secret_key and other_start > nonce and other.cancel():
+                                    search['in_flight'] -= 1
+                    finish_block(secret_key, start, last)
+                fill()
+
+                if time.monotonic() - last_checkpoint >= checkpoint_interval:
+                    save_checkpoint(state_path, state)
+                    report()
+                    last_checkpoint = time.monotonic()
+        finally:
+            save_checkpoint(state_path, state)
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    report()
+    return {secret_key: progress[secret_key]['nonce'] for secret_key in secret_keys}
+
 def main():
-    secret_key = "ckczppom"
-    result = find_lowest_number(secret_key)
-    print(f"The lowest number for prefix '00000' is: {result}")
+    # Parse command-line arguments
+    parser = argparse.ArgumentParser(description="Advent of Code 2015 - Day 4")
+    parser.add_argument(
+        '--key',
+        type=str,
+        default="ckczppom",
+        help='Secret key to mine (default: ckczppom)'
+    )
+    parser.add_argument(
+        '--keys-file',
+        type=str,
+        help='Mine every secret key in this file (one per line) as a resumable batch job'
+    )
+    parser.add_argument(
+        '--state',
+        type=str,
+        default='advent_coin_state.json',
+        help='Checkpoint file for batch jobs (default: advent_coin_state.json)'
+    )
+    parser.add_argument(
+        '--checkpoint-interval',
+        type=float,
+        default=DEFAULT_CHECKPOINT_INTERVAL,
+        help=f'Seconds between checkpoints in batch jobs (default: {DEFAULT_CHECKPOINT_INTERVAL})'
+    )
+    parser.add_argument(
+        '--prefix',
+        type=str,
+        default="000000",
+        help='Required hash prefix (default: 000000)'
+    )
+    parser.add_argument(
+        '--targets',
+        type=str,
+        nargs='+',
+        help='Find the lowest number for each of these prefixes in a single sweep'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=0,
+        help='Mine with this many worker processes (default: 0, single process)'
+    )
+    parser.add_argument(
+        '--fast',
+        action='store_true',
+        help='Use the digest-level inner loop in single-process mode'
+    )
+    parser.add_argument(
+        '--benchmark',
+        action='store_true',
+        help='Compare hashing throughput of the original and fast inner loops'
+    )
+    args = parser.parse_args()
+
+    if args.keys_file:
+        try:
+            with open(args.keys_file, 'r') as file:
+                secret_keys = [line.strip() for line in file if line.strip()]
+        except FileNotFoundError:
+            print(f"Input file not found: {args.keys_file}")
+            return
+
+        results = mine_keys(secret_keys, args.prefix, args.state, args.workers or None,
+                            checkpoint_interval=args.checkpoint_interval)
+        for secret_key, nonce in results.items():
+            print(f"The lowest number for key '{secret_key}' and prefix '{args.prefix}' is: {nonce}")
+        return
+
+    secret_key = args.key
+    if args.benchmark:
+        rates = benchmark(secret_key, args.prefix)
+        print(f"Original loop: {rates['baseline']:,.0f} hashes/sec")
+        print(f"Fast loop: {rates['fast']:,.0f} hashes/sec ({rates['speedup']:.2f}x)")
+        return
+
+    if args.targets:
+        results = find_lowest_numbers(secret_key, args.targets)
+        for prefix in sorted(results, key=len):
+            print(f"The lowest number for prefix '{prefix}' is: {results[prefix]}")
+        return
+
+    if args.workers:
+        result, stats = find_lowest_number_parallel(secret_key, args.prefix, args.workers)
+        for pid, worker in sorted(stats.items()):
+            print(f"Worker {pid}: {worker['hashes']} hashes, {worker['rate']:,.0f} hashes/sec")
+    elif args.fast:
+        result = find_lowest_number_fast(secret_key, args.prefix)
+    else:
+        result = find_lowest_number(secret_key, args.prefix)
+    print(f"The lowest number for prefix '{args.prefix}' is: {result}")
 
 if __name__ == "__main__":
     main()
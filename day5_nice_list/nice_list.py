@@ -1,4 +1,12 @@
 import argparse
+import mmap
+import os
+import random
+import re
+import string
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from aocd import get_data
 
 def has_three_vowels(s: str) -> bool:
@@ -111,6 +119,381 @@ def is_nice_part2(s: str) -> bool:
         has_repeating_letter_with_gap(s)
     )
 
+RULE_NAMES = ("three_vowels", "double_letter", "no_forbidden_substrings",
+              "repeating_pair", "repeating_letter_with_gap")
+
+SHORT_STRING = 64  # Up to this length, C-level substring searches beat a Python-level pair scan
+
+# Rules a regex checks in one linear scan: each match attempt has a fixed length
+DOUBLE_LETTER = re.compile(r'(.)\1', re.DOTALL)
+FORBIDDEN = re.compile(r'ab|cd|pq|xy')
+LETTER_WITH_GAP = re.compile(r'(.).\1', re.DOTALL)
+
+def has_repeating_pair_linear(s: str) -> bool:
+    """
+    Checks for a pair that appears twice without overlapping, in linear time.
+
+    Each pair is looked up among the pairs that ended at least one character
+    earlier, so overlapping occurrences such as "aaa" never count. Short
+    strings use substring searches instead, which are faster there and
+    bounded by SHORT_STRING.
+
+    Args:
+        s (str): The input string.
+
+    Returns:
+        bool: True if the string contains a repeating pair, False otherwise.
+    """
+    if len(s) <= SHORT_STRING:
+        for i in range(len(s) - 3):
+            if s[i:i + 2] in s[i + 2:]:
+                return True
+        return False
+
+    seen = set()
+    lagged = None
+    for pair in zip(s, s[1:]):
+        if pair in seen:
+            return True
+        seen.add(lagged)  # The previous pair overlaps this one, so it joins only now
+        lagged = pair
+    return False
+
+def check_rules(s: str) -> tuple:
+    """
+    Evaluates every part 1 and part 2 rule in linear time.
+
+    Vowels are counted with str.count, the fixed-width rules are single
+    regex scans and repeating pairs use has_repeating_pair_linear, so no
+    rule rescans the string from every position.
+
+    Args:
+        s (str): The input string.
+
+    Returns:
+        tuple: One bool per rule, in RULE_NAMES order, True if the rule passes.
+    """
+    return (
+        sum(map(s.count, "aeiou")) >= 3,
+        DOUBLE_LETTER.search(s) is not None,
+        FORBIDDEN.search(s) is None,
+        has_repeating_pair_linear(s),
+        LETTER_WITH_GAP.search(s) is not None,
+    )
+
+def classify(s: str) -> tuple:
+    """
+    Evaluates the part 1 and part 2 verdicts with the checks of check_rules.
+
+    Each verdict stops at its first failing rule, cheapest rule first, so
+    most strings never reach the repeating-pair scan.
+
+    Args:
+        s (str): The input string.
+
+    Returns:
+        tuple: (nice, nice_part2) verdicts for the two rule sets.
+    """
+    nice = (FORBIDDEN.search(s) is None and DOUBLE_LETTER.search(s) is not None
+            and sum(map(s.count, "aeiou")) >= 3)
+    nice_part2 = LETTER_WITH_GAP.search(s) is not None and has_repeating_pair_linear(s)
+    return nice, nice_part2
+
+def at_least(count: int, charset: str) -> tuple:
+    """
+    Rule: the string contains at least count characters from charset.
+
+    Raises:
+        ValueError: If charset is empty.
+    """
+    if not charset:
+        raise ValueError("at_least needs a non-empty charset")
+    return ('at_least', count, charset)
+
+def adjacent_repeat() -> tuple:
+    """
+    Rule: some character appears twice in a row.
+    """
+    return ('repeat_with_gap', 0)
+
+def forbidden_substrings(*substrings: str) -> tuple:
+    """
+    Rule: none of the substrings occur in the string.
+    """
+    return ('forbidden', substrings)
+
+def repeated_pair() -> tuple:
+    """
+    Rule: some pair of characters appears at least twice without overlapping.
+    """
+    return ('repeated_pair',)
+
+def repeat_with_gap(gap: int) -> tuple:
+    """
+    Rule: some character repeats with exactly gap characters between.
+    """
+    return ('repeat_with_gap', gap)
+
+PART1_RULES = (at_least(3, "aeiou"), adjacent_repeat(), forbidden_substrings("ab", "cd", "pq", "xy"))
+PART2_RULES = (repeated_pair(), repeat_with_gap(1))
+
+def _rule_pattern(rule: tuple, group: str) -> str:
+    """
+    Translates one rule into a zero-width regex assertion anchored at the start.
+
+    repeated_pair has no linear-time regex, so compile_rules checks it with
+    has_repeating_pair_linear instead of calling this.
+
+    Args:
+        rule (tuple): A rule built by one of the rule constructors.
+        group (str): A group name unique within the rule set, for backreferences.
+
+    Returns:
+        str: A lookahead (or negative lookahead) that holds iff the rule passes.
+
+    Raises:
+        ValueError: If the rule kind is unknown.
+    """
+    kind = rule[0]
+    if kind == 'at_least':
+        _, count, charset = rule
+        members = ''.join(re.escape(char) for char in charset)
+        return f"(?=(?:[^{members}]*[{members}]){{{count}}})"
+    if kind == 'forbidden':
+        alternatives = '|'.join(re.escape(sub) for sub in rule[1])
+        return f"(?!.*?(?:{alternatives}))"
+    if kind == 'repeat_with_gap':
+        return f"(?=.*?(?P<{group}>.).{{{rule[1]}}}(?P={group}))"
+    raise ValueError(f"Unknown rule: {rule}")
+
+class CompiledRules:
+    """
+    A rule set compiled into one regex plus the linear scans a regex cannot replace.
+    """
+
+    def __init__(self, pattern: re.Pattern, scans: tuple):
+        """
+        Args:
+            pattern (re.Pattern): Lookaheads for every rule a regex checks in linear time
+            scans (tuple): Functions taking a string, one per remaining rule
+        """
+        self.pattern = pattern
+        self.scans = scans
+
+    def match(self, s: str) -> bool:
+        """
+        Return True if the string passes every rule.
+        """
+        return self.pattern.match(s) is not None and all(scan(s) for scan in self.scans)
+
+def compile_rules(rules) -> CompiledRules:
+    """
+    Compiles a rule set into a single regex that matches only nice strings.
+
+    Each rule becomes a lookahead at the start of the string, so the rule
+    set is evaluated by one call into the regex engine. repeated_pair rules
+    would need a backtracking lookahead that is quadratic on strings that
+    fail them, so they run as has_repeating_pair_linear after the regex
+    passes. Compile once and reuse the result across any number of strings.
+
+    Args:
+        rules: Rules built by at_least, adjacent_repeat, forbidden_substrings,
+               repeated_pair and repeat_with_gap.
+
+    Returns:
+        CompiledRules: Use compiled.match(s) to test a string.
+    """
+    assertions = ''.join(_rule_pattern(rule, f"r{index}") for index, rule in enumerate(rules)
+                         if rule[0] != 'repeated_pair')
+    scans = tuple(has_repeating_pair_linear for rule in rules if rule[0] == 'repeated_pair')
+    return CompiledRules(re.compile(assertions, re.DOTALL), scans)
+
+def count_nice(strings, pattern: CompiledRules) -> int:
+    """
+    Counts the strings accepted by a compiled rule set.
+
+    Args:
+        strings: The strings to classify.
+        pattern (CompiledRules): A rule set compiled by compile_rules.
+
+    Returns:
+        int: Number of nice strings.
+    """
+    match = pattern.match
+    return sum(1 for s in strings if match(s))
+
+def _chunk_bounds(mapped, chunk_count: int) -> list:
+    """
+    Splits a mapped corpus into byte ranges that end on line boundaries.
+
+    Args:
+        mapped (mmap.mmap): The mapped corpus.
+        chunk_count (int): Desired number of chunks.
+
+    Returns:
+        list: (start, end) byte offsets covering the whole corpus.
+    """
+    size = len(mapped)
+    boundaries = [0]
+    for index in range(1, chunk_count):
+        newline = mapped.find(b'\n', max(size * index // chunk_count, boundaries[-1]))
+        if newline == -1:
+            break
+        if newline + 1 > boundaries[-1]:
+            boundaries.append(newline + 1)
+    boundaries.append(size)
+    return [(start, end) for start, end in zip(boundaries, boundaries[1:]) if end > start]
+
+def _classify_chunk(task: tuple) -> tuple:
+    """
+    Classifies the lines of one chunk of a memory-mapped corpus.
+
+    Lines are arbitrary bytes decoded as latin-1, so they go through classify
+    or check_rules, whose cost stays linear in the line length.
+
+    Args:
+        task (tuple): (path, start, end, histogram) describing the chunk.
+
+    Returns:
+        tuple: (nice, nice_part2, rejections) where rejections counts, per
+               rule, the strings rejected by it (empty unless histogram).
+    """
+    path, start, end, histogram = task
+    nice = nice_part2 = 0
+    rejections = Counter()
+    with open(path, 'rb') as file, \
+            mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        position = start
+        while position < end:
+            newline = mapped.find(b'\n', position, end)
+            line_end = end if newline == -1 else newline
+            s = mapped[position:line_end].decode('latin-1')
+            position = line_end + 1
+
+            if histogram:
+                rules = check_rules(s)
+                part1, part2 = all(rules[:3]), all(rules[3:])
+                for name, passed in zip(RULE_NAMES, rules):
+                    if not passed:
+                        rejections[name] += 1
+            else:
+                part1, part2 = classify(s)
+            nice += part1
+            nice_part2 += part2
+    return nice, nice_part2, rejections
+
+def count_nice_mmap(path: str, workers: int = 0, chunk_count: int = None,
+                    histogram: bool = False) -> dict:
+    """
+    Counts nice strings in a memory-mapped corpus, one string per line.
+
+    The corpus is split into newline-aligned chunks that are classified
+    independently, optionally in a process pool; lines are read straight
+    from the mapping, so no list of lines is ever built.
+
+    Args:
+        path (str): Path to the corpus.
+        workers (int): Number of worker processes; 0 classifies in-process.
+        chunk_count (int, optional): Number of chunks (default: 4 per worker).
+        histogram (bool): Also count how many strings each rule rejects.
+
+    Returns:
+        dict: 'nice' and 'nice_part2' counts, and 'rejections' mapping each
+              rule name to the number of strings failing it.
+    """
+    if os.path.getsize(path) == 0:
+        return {'nice': 0, 'nice_part2': 0, 'rejections': {}}
+    with open(path, 'rb') as file, \
+            mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        bounds = _chunk_bounds(mapped, chunk_count or 4 * max(workers, 1))
+    tasks = [(path, start, end, histogram) for start, end in bounds]
+
+    if workers:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_classify_chunk, tasks))
+    else:
+        results = [_classify_chunk(task) for task in tasks]
+
+    rejections = Counter()
+    for _, _, chunk_rejections in results:
+        rejections.update(chunk_rejections)
+    return {
+        'nice': sum(result[0] for result in results),
+        'nice_part2': sum(result[1] for result in results),
+        'rejections': dict(rejections),
+    }
+
+def _without_repeated_pair(length: int, seed: int = 0) -> str:
+    """
+    Builds a latin-1 string with an "x?x" gap match but no pair occurring twice.
+
+    Such strings pass the cheap part 2 check and then fail the repeating
+    pair rule only after the whole string has been scanned, which is the
+    worst case for any pair search that rescans from every position.
+
+    Args:
+        length (int): Desired length; the walk stops early if it runs out of pairs.
+        seed (int): Random seed.
+
+    Returns:
+        str: The generated string.
+    """
+    rng = random.Random(seed)
+    alphabet = [chr(code) for code in range(0x20, 0x100)]
+    chars = ['x', 'y', 'x']
+    used = {('x', 'y'), ('y', 'x')}
+    while len(chars) < length:
+        previous = chars[-1]
+        choices = [char for char in alphabet if (previous, char) not in used]
+        if not choices:
+            break
+        char = rng.choice(choices)
+        used.add((previous, char))
+        chars.append(char)
+    return ''.join(chars)
+
+def benchmark(count: int = 200_000) -> dict:
+    """
+    Times the original rule functions against classify and check_rules.
+
+    Three cases are timed: count puzzle-sized (16 character) random strings,
+    where per-call overhead dominates; long random strings, where scanning
+    does; and long strings with no repeated pair, where rescanning from
+    every position is quadratic.
+
+    Args:
+        count (int): Number of puzzle-sized strings.
+
+    Returns:
+        dict: Maps each case to 'original', 'classify' and 'single_pass'
+              (check_rules) timings in seconds, and classify's 'speedup'.
+    """
+    cases = {
+        'short': [''.join(random.choices(string.ascii_lowercase, k=16)) for _ in range(count)],
+        'long': [''.join(random.choices(string.ascii_lowercase, k=10_000)) for _ in range(100)],
+        'no repeated pair': [_without_repeated_pair(8_000, seed) for seed in range(10)],
+    }
+    results = {}
+    for name, strings in cases.items():
+        began = time.perf_counter()
+        for s in strings:
+            is_nice(s), is_nice_part2(s)
+        original = time.perf_counter() - began
+
+        began = time.perf_counter()
+        for s in strings:
+            classify(s)
+        classified = time.perf_counter() - began
+
+        began = time.perf_counter()
+        for s in strings:
+            check_rules(s)
+        single_pass = time.perf_counter() - began
+
+        results[name] = {'original': original, 'classify': classified,
+                         'single_pass': single_pass, 'speedup': original / classified}
+    return results
+
 def main():
     # Parse command-line arguments
     parser = argparse.ArgumentParser(description="Advent of Code 2015 - Day 5")
@@ -126,8 +509,63 @@ def main():
         type=str,
         help='Use a local file instead of fetching data from adventofcode.com'
     )
+    parser.add_argument(
+        '--fast',
+        action='store_true',
+        help='Classify each string for both parts with linear-time rule checks'
+    )
+    parser.add_argument(
+        '--compiled',
+        action='store_true',
+        help='Classify with the compiled rule-set matcher'
+    )
+    parser.add_argument(
+        '--mmap',
+        action='store_true',
+        help='Memory-map the --use-file corpus and classify it in chunks for both parts'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=0,
+        help='Worker processes for --mmap (default: 0, run in-process)'
+    )
+    parser.add_argument(
+        '--histogram',
+        action='store_true',
+        help='With --mmap, also report how many strings each rule rejects'
+    )
+    parser.add_argument(
+        '--benchmark',
+        action='store_true',
+        help='Time the original rules, check_rules and classify on short, long and adversarial strings'
+    )
     args = parser.parse_args()
 
+    if args.benchmark:
+        for name, timings in benchmark().items():
+            print(f"{name.capitalize()} strings:")
+            print(f"  Original rules: {timings['original']:.3f}s")
+            print(f"  check_rules: {timings['single_pass']:.3f}s")
+            print(f"  Classify: {timings['classify']:.3f}s ({timings['speedup']:.1f}x)")
+        return
+
+    if args.mmap:
+        if not args.use_file:
+            print("--mmap requires --use-file")
+            return
+        try:
+            counts = count_nice_mmap(args.use_file, args.workers, histogram=args.histogram)
+        except FileNotFoundError:
+            print(f"Input file not found: {args.use_file}")
+            return
+        print(f"Part 1 - Total number of nice strings: {counts['nice']}")
+        print(f"Part 2 - Total number of nice strings: {counts['nice_part2']}")
+        for name in RULE_NAMES:
+            if name in counts['rejections']:
+                print(f"Rejected by {name}: {counts['rejections'][name]}")
+        return
+
     # Get the input data
     if args.use_file:
         try:
@@ -149,7 +587,15 @@ def main():
     strings = data.strip().split('\n')
 
     # Process strings and count "nice" ones
-    if args.part == 1:
+    if args.compiled:
+        rules = PART1_RULES if args.part == 1 else PART2_RULES
+        nice_count = count_nice(strings, compile_rules(rules))
+        print(f"Part {args.part} - Total number of nice strings: {nice_count}")
+    elif args.fast:
+        verdicts = [classify(s) for s in strings]
+        nice_count = sum(verdict[args.part - 1] for verdict in verdicts)
+        print(f"Part {args.part} - Total number of nice strings: {nice_count}")
+    elif args.part == 1:
         nice_count = sum(1 for s in strings if is_nice(s))
         print(f"Part 1 - Total number of nice strings: {nice_count}")
     else:  # part 2
@@ -1,7 +1,11 @@
 import argparse
 import re
+
+import numpy as np
 from aocd import get_data
 
+GRID_SIZE = 1000
+
 def parse_instruction(instruction: str) -> tuple[str, tuple[int, int], tuple[int, int]]:
     """
     Parse a single instruction and return the operation and coordinates.
@@ -82,6 +86,302 @@ def process_instructions_part2(instructions: list[str]) -> int:
     # Sum all brightness levels
     return sum(sum(row) for row in grid)
 
+class LightGrid:
+    """
+    A light grid stored as one contiguous typed NumPy array.
+
+    Part 1 grids hold a bool per light; part 2 grids hold an integer
+    brightness per light. Instructions are applied to a rectangle at a time
+    with vectorized slice operations.
+    """
+
+    def __init__(self, width: int = GRID_SIZE, height: int = GRID_SIZE, brightness: bool = False):
+        """
+        Create a grid with every light off.
+
+        Args:
+            width (int): Number of columns (x coordinates)
+            height (int): Number of rows (y coordinates)
+            brightness (bool): Track part 2 brightness instead of on/off
+        """
+        self.brightness = brightness
+        self.cells = np.zeros((width, height), dtype=np.int32 if brightness else np.bool_)
+        self._summed_area = None  # Rebuilt lazily by region queries after updates
+
+    def apply(self, operation: str, start: tuple[int, int], end: tuple[int, int]) -> None:
+        """
+        Apply one operation to the inclusive rectangle from start to end.
+
+        Args:
+            operation (str): "turn on", "turn off" or "toggle"
+            start (tuple[int, int]): (start_x, start_y)
+            end (tuple[int, int]): (end_x, end_y)
+        """
+        self._summed_area = None
+        region = self.cells[start[0]:end[0] + 1, start[1]:end[1] + 1]
+        if self.brightness:
+            if operation == "turn on":
+                region += 1
+            elif operation == "turn off":
+                np.subtract(region, 1, out=region)
+                np.maximum(region, 0, out=region)
+            elif operation == "toggle":
+                region += 2
+        else:
+            if operation == "turn on":
+                region[...] = True
+            elif operation == "turn off":
+                region[...] = False
+            elif operation == "toggle":
+                np.logical_not(region, out=region)
+
+    def apply_instructions(self, instructions: list[str]) -> None:
+        """
+        Parse and apply a list of instructions in order.
+
+        Args:
+            instructions (list[str]): List of instruction strings
+        """
+        for instruction in instructions:
+            operation, start, end = parse_instruction(instruction)
+            self.apply(operation, start, end)
+
+    def total(self) -> int:
+        """
+        Return the number of lit lights, or the total brightness for part 2.
+
+        Returns:
+            int: Sum over the whole grid
+        """
+        return int(self.cells.sum(dtype=np.int64))
+
+    def _table(self) -> np.ndarray:
+        """
+        Return the summed-area table, rebuilding it if the grid has changed.
+
+        Returns:
+            np.ndarray: table[x, y] is the sum of cells[:x, :y]
+        """
+        if self._summed_area is None:
+            width, height = self.cells.shape
+            table = np.zeros((width + 1, height + 1), dtype=np.int64)
+            np.cumsum(self.cells, axis=0, dtype=np.int64, out=table[1:, 1:])
+            np.cumsum(table[1:, 1:], axis=1, out=table[1:, 1:])
+            self._summed_area = table
+        return self._summed_area
+
+    def region_total(self, start: tuple[int, int], end: tuple[int, int]) -> int:
+        """
+        Return the lit count or brightness inside an inclusive rectangle in O(1).
+
+        The rectangle is clipped to the grid like the slices in apply, so
+        parts outside the grid and reversed ranges count as empty.
+
+        Args:
+            start (tuple[int, int]): (start_x, start_y)
+            end (tuple[int, int]): (end_x, end_y)
+
+        Returns:
+            int: Sum of the cells in the rectangle
+        """
+        return self.region_totals([(start, end)])[0]
+
+    def region_totals(self, rectangles: list[tuple[tuple[int, int], tuple[int, int]]]) -> list[int]:
+        """
+        Answer many rectangle queries at once against the summed-area table.
+
+        Args:
+            rectangles (list): (start, end) pairs of inclusive rectangles, clipped
+                to the grid as in region_total
+
+        Returns:
+            list[int]: Sum of the cells in each rectangle, in order
+        """
+        table = self._table()
+        width, height = self.cells.shape
+        corners = np.array([(*start, *end) for start, end in rectangles], dtype=np.int64).reshape(-1, 4)
+        x1 = np.clip(corners[:, 0], 0, width)
+        y1 = np.clip(corners[:, 1], 0, height)
+        # An end before its start leaves an empty range, as an empty slice would
+        x2 = np.maximum(np.clip(corners[:, 2] + 1, 0, width), x1)
+        y2 = np.maximum(np.clip(corners[:, 3] + 1, 0, height), y1)
+        totals = table[x2, y2] - table[x1, y2] - table[x2, y1] + table[x1, y1]
+        return totals.tolist()
+
+class BitLightGrid:
+    """
+    A part 1 light grid with each row bit-packed into a Python integer.
+
+    Bit y of row x is light (x, y). An instruction becomes one OR, AND-NOT
+    or XOR with a column mask per affected row, and lit lights are counted
+    with a popcount.
+    """
+
+    def __init__(self, width: int = GRID_SIZE, height: int = GRID_SIZE):
+        """
+        Create a grid with every light off.
+
+        Args:
+            width (int): Number of rows (x coordinates)
+            height (int): Number of bits per row (y coordinates)
+        """
+        self.height = height
+        self.rows = [0] * width
+
+    def apply(self, operation: str, start: tuple[int, int], end: tuple[int, int]) -> None:
+        """
+        Apply one operation to the inclusive rectangle from start to end.
+
+        Args:
+            operation (str): "turn on", "turn off" or "toggle"
+            start (tuple[int, int]): (start_x, start_y)
+            end (tuple[int, int]): (end_x, end_y)
+        """
+        last_y = min(end[1], self.height - 1)
+        if start[1] > last_y:
+            return
+        mask = ((1 << (last_y - start[1] + 1)) - 1) << start[1]
+        rows = self.rows
+        selected = range(start[0], min(end[0] + 1, len(rows)))
+        if operation == "turn on":
+            for x in selected:
+                rows[x] |= mask
+        elif operation == "turn off":
+            for x in selected:
+                rows[x] &= ~mask
+        elif operation == "toggle":
+            for x in selected:
+                rows[x] ^= mask
+
+    def apply_instructions(self, instructions: list[str]) -> None:
+        """
+        Parse and apply a list of instructions in order.
+
+        Args:
+            instructions (list[str]): List of instruction strings
+        """
+        for instruction in instructions:
+            operation, start, end = parse_instruction(instruction)
+            self.apply(operation, start, end)
+
+    def total(self) -> int:
+        """
+        Return the number of lit lights.
+
+        Returns:
+            int: Popcount over all rows
+        """
+        return sum(row.bit_count() for row in self.rows)
+
+def parse_query(query: str) -> tuple[tuple[int, int], tuple[int, int]]:
+    """
+    Parse a region query such as "0,0 through 999,999".
+
+    Args:
+        query (str): The query string
+
+    Returns:
+        tuple: ((start_x, start_y), (end_x, end_y))
+    """
+    match = re.match(r'(\d+),(\d+) through (\d+),(\d+)', query.strip())
+
+    if not match:
+        raise ValueError(f"Invalid query format: {query}")
+
+    start_x, start_y, end_x, end_y = map(int, match.groups())
+    return (start_x, start_y), (end_x, end_y)
+
+def query_regions_from_file(grid: LightGrid, path: str) -> list[int]:
+    """
+    Answer every region query in a file, one "x1,y1 through x2,y2" per line.
+
+    Args:
+        grid (LightGrid): The grid after all instructions have been applied
+        path (str): Path to the query file
+
+    Returns:
+        list[int]: Lit count or brightness for each query, in file order
+    """
+    with open(path, 'r') as file:
+        rectangles = [parse_query(line) for line in file if line.strip()]
+    return grid.region_totals(rectangles)
+
+def process_instructions_grid(instructions: list[str], part: int) -> int:
+    """
+    Process instructions with the array-backed LightGrid.
+
+    Args:
+        instructions (list[str]): List of instruction strings
+        part (int): 1 for on/off lights, 2 for brightness
+
+    Returns:
+        int: Number of lights on (part 1) or total brightness (part 2)
+    """
+    grid = LightGrid(brightness=part == 2)
+    grid.apply_instructions(instructions)
+    return grid.total()
+
+def _compressed_axis(bounds: list[tuple[int, int]], extent: int) -> tuple[dict[int, int], list[int]]:
+    """
+    Compress one axis to the boundaries of the instruction rectangles.
+
+    Args:
+        bounds (list[tuple[int, int]]): Inclusive (start, end) ranges on this axis
+        extent (int): Size of the grid along this axis
+
+    Returns:
+        tuple: (index, widths) where index maps each boundary coordinate to its
+               compressed cell and widths holds the size of every compressed
+               cell as Python integers, so any extent is exact
+    """
+    edges = {0, extent}
+    for start, end in bounds:
+        edges.add(min(start, extent))
+        edges.add(min(end + 1, extent))
+    edges = sorted(edges)
+    index = {edge: position for position, edge in enumerate(edges)}
+    return index, [end - start for start, end in zip(edges, edges[1:])]
+
+def process_instructions_compressed(instructions: list[str], part: int,
+                                    width: int = GRID_SIZE, height: int = GRID_SIZE) -> int:
+    """
+    Process instructions on a coordinate-compressed grid.
+
+    Only the rectangle boundaries split the grid, so every compressed cell
+    covers a block of lights that always share the same state. Operations
+    are applied to compressed cells and the result is weighted by each
+    cell's area; memory and time depend on the number of instructions,
+    not on the grid extent.
+
+    Args:
+        instructions (list[str]): List of instruction strings
+        part (int): 1 for on/off lights, 2 for brightness
+        width (int): Number of columns (x coordinates) in the virtual grid
+        height (int): Number of rows (y coordinates) in the virtual grid
+
+    Returns:
+        int: Number of lights on (part 1) or total brightness (part 2)
+    """
+    parsed = [parse_instruction(instruction) for instruction in instructions]
+    x_index, x_widths = _compressed_axis([(start[0], end[0]) for _, start, end in parsed], width)
+    y_index, y_widths = _compressed_axis([(start[1], end[1]) for _, start, end in parsed], height)
+
+    grid = LightGrid(len(x_widths), len(y_widths), brightness=part == 2)
+    for operation, start, end in parsed:
+        if start[0] >= width or start[1] >= height:
+            continue  # Entirely outside the grid
+        grid.apply(operation,
+                   (x_index[start[0]], y_index[start[1]]),
+                   (x_index[min(end[0] + 1, width)] - 1, y_index[min(end[1] + 1, height)] - 1))
+
+    # Weight each cell by its area. Every partial sum is at most the brightest
+    # cell times the grid area, so int64 is exact below that bound; larger
+    # grids are summed with Python integers instead.
+    peak = int(grid.cells.max()) if grid.cells.size else 0
+    dtype = np.int64 if peak * width * height < 2 ** 63 else object
+    row_totals = grid.cells.astype(dtype) @ np.array(y_widths, dtype=dtype)
+    return int(row_totals @ np.array(x_widths, dtype=dtype))
+
 def main():
     # Parse command-line arguments
     parser = argparse.ArgumentParser(description="Advent of Code 2015 - Day 6: Probably a Fire Hazard")
@@ -97,8 +397,36 @@ def main():
         type=str,
         help='Use a local file instead of fetching data from adventofcode.com'
     )
+    parser.add_argument(
+        '--engine',
+        choices=['lists', 'numpy', 'compressed', 'bits'],
+        help='Grid implementation to use (default: lists, or numpy with --queries)'
+    )
+    parser.add_argument(
+        '--queries',
+        type=str,
+        help='Report totals for each "x1,y1 through x2,y2" rectangle in this file (numpy engine)'
+    )
+    parser.add_argument(
+        '--width',
+        type=int,
+        default=GRID_SIZE,
+        help=f'Grid width for the compressed engine (default: {GRID_SIZE})'
+    )
+    parser.add_argument(
+        '--height',
+        type=int,
+        default=GRID_SIZE,
+        help=f'Grid height for the compressed engine (default: {GRID_SIZE})'
+    )
     args = parser.parse_args()
 
+    # Region queries need the summed-area table of the numpy grid
+    if args.engine is None:
+        args.engine = 'numpy' if args.queries else 'lists'
+    elif args.queries and args.engine != 'numpy':
+        parser.error(f"--queries requires the numpy engine, not {args.engine}")
+
     # Get the input data
     if args.use_file:
         try:
@@ -120,7 +448,37 @@ def main():
     instructions = data.strip().split('\n')
 
     # Process instructions
-    if args.part == 1:
+    if args.engine != 'lists':
+        if args.engine == 'numpy' and args.queries:
+            grid = LightGrid(brightness=args.part == 2)
+            grid.apply_instructions(instructions)
+            try:
+                totals = query_regions_from_file(grid, args.queries)
+            except FileNotFoundError:
+                print(f"Query file not found: {args.queries}")
+                return
+            except ValueError as e:
+                print(e)
+                return
+            for number, total in enumerate(totals, start=1):
+                print(f"Query {number}: {total}")
+            result = grid.total()
+        elif args.engine == 'numpy':
+            result = process_instructions_grid(instructions, args.part)
+        elif args.engine == 'bits':
+            if args.part != 1:
+                print("The bits engine only tracks on/off lights (part 1)")
+                return
+            grid = BitLightGrid()
+            grid.apply_instructions(instructions)
+            result = grid.total()
+        else:
+            result = process_instructions_compressed(instructions, args.part, args.width, args.height)
+        if args.part == 1:
+            print(f"Part 1 - Number of lights turned on: {result}")
+        else:
+            print(f"Part 2 - Total brightness: {result}")
+    elif args.part == 1:
         result = process_instructions_part1(instructions)
         print(f"Part 1 - Number of lights turned on: {result}")
     else:  # part 2
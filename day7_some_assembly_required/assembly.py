@@ -1,7 +1,356 @@
 import argparse
+import hashlib
+import marshal
+import os
+import pickle
 import re
+import sys
+from array import array
 from aocd import get_data
-from functools import lru_cache
+
+import numpy as np
+
+# Netlist opcodes
+OP_CONST = 0      # Literal value, stored in the left operand slot
+OP_UNDEFINED = 1  # Wire that is used but never driven
+OP_ASSIGN = 2
+OP_NOT = 3
+OP_AND = 4
+OP_OR = 5
+OP_LSHIFT = 6
+OP_RSHIFT = 7
+
+BINARY_OPCODES = {"AND": OP_AND, "OR": OP_OR, "LSHIFT": OP_LSHIFT, "RSHIFT": OP_RSHIFT}
+
+# Python expression templates for code generation; only NOT and LSHIFT can leave 16 bits
+GATE_TEMPLATES = {
+    OP_ASSIGN: "{a}",
+    OP_NOT: "~{a} & 0xFFFF",
+    OP_AND: "{a} & {b}",
+    OP_OR: "{a} | {b}",
+    OP_LSHIFT: "({a} << {b}) & 0xFFFF",
+    OP_RSHIFT: "{a} >> {b}",
+}
+
+CIRCUIT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '__pycache__', 'circuits')
+
+class Netlist:
+    """
+    A circuit compiled to integer-indexed arrays in topological order.
+
+    Every wire and every literal is a node. Node i is computed by
+    opcodes[i] from the nodes left[i] and right[i] (unused slots hold -1),
+    and order lists the nodes so that operands always come first.
+    """
+
+    def __init__(self, expressions: dict[str, str]):
+        """
+        Compile wire expressions, e.g. {"z": "x AND y"}, into a netlist.
+
+        Raises:
+            ValueError: If an expression is malformed or the wires form a cycle.
+        """
+        self.names = []
+        self.index = {}
+        self.opcodes = array('b')
+        self.left = array('q')
+        self.right = array('q')
+
+        # Driven wires first, so their node numbers follow the input order
+        for wire in expressions:
+            self._node(wire)
+        for wire, expression in expressions.items():
+            self._compile_gate(self.index[wire], expression)
+
+        self.fanout = [[] for _ in self.names]
+        for node in range(len(self.names)):
+            for operand in self.operands(node):
+                self.fanout[operand].append(node)
+        self.order = self._topological_order()
+        self.rank = array('q', bytes(8 * len(self.order)))
+        for position, node in enumerate(self.order):
+            self.rank[node] = position
+
+    def _node(self, name: str) -> int:
+        """Return the node number for a wire or literal, creating it if needed."""
+        node = self.index.get(name)
+        if node is None:
+            node = len(self.names)
+            self.index[name] = node
+            self.names.append(name)
+            if name.isdigit():
+                self.opcodes.append(OP_CONST)
+                self.left.append(int(name))
+            else:
+                self.opcodes.append(OP_UNDEFINED)
+                self.left.append(-1)
+            self.right.append(-1)
+        return node
+
+    def _compile_gate(self, node: int, expression: str):
+        """Parse an expression once and store it as the gate driving node."""
+        tokens = expression.split()
+
+        if len(tokens) == 1:
+            opcode, left, right = OP_ASSIGN, self._node(tokens[0]), -1
+        elif len(tokens) == 2:
+            if tokens[0] != "NOT":
+                raise ValueError(f"Invalid unary operation: {expression}")
+            opcode, left, right = OP_NOT, self._node(tokens[1]), -1
+        elif len(tokens) == 3:
+            if tokens[1] not in BINARY_OPCODES:
+                raise ValueError(f"Unknown operation: {tokens[1]}")
+            opcode = BINARY_OPCODES[tokens[1]]
+            left, right = self._node(tokens[0]), self._node(tokens[2])
+        else:
+            raise ValueError(f"Invalid expression: {expression}")
+
+        self.opcodes[node] = opcode
+        self.left[node] = left
+        self.right[node] = right
+
+    def operands(self, node: int) -> tuple:
+        """Return the nodes that node reads."""
+        opcode = self.opcodes[node]
+        if opcode <= OP_UNDEFINED:
+            return ()
+        if opcode <= OP_NOT:
+            return (self.left[node],)
+        return (self.left[node], self.right[node])
+
+    def _topological_order(self) -> list[int]:
+        """Order the nodes so every gate follows its operands (Kahn's algorithm)."""
+        pending = [len(self.operands(node)) for node in range(len(self.names))]
+        order = [node for node, count in enumerate(pending) if count == 0]
+        for node in order:  # order grows while it is being walked
+            for reader in self.fanout[node]:
+                pending[reader] -= 1
+                if pending[reader] == 0:
+                    order.append(reader)
+
+        if len(order) < len(self.names):
+            stuck = next(node for node, count in enumerate(pending) if count)
+            raise ValueError(f"Circuit contains a cycle through wire: {self.names[stuck]}")
+        return order
+
+    def evaluate(self, pinned: dict[int, int] = None) -> list:
+        """
+        Evaluate every node in one sweep over the topological order.
+
+        Args:
+            pinned (dict[int, int], optional): Node values to use as-is instead of computing them
+
+        Returns:
+            list: The value of each node, or None where it depends on an undefined wire
+        """
+        values = [None] * len(self.names)
+        self.evaluate_nodes(self.order, values, pinned or {})
+        return values
+
+    def evaluate_nodes(self, nodes: list[int], values: list, pinned: dict[int, int]) -> int:
+        """
+        Recompute the given nodes in place, in the order given.
+
+        Args:
+            nodes (list[int]): Nodes to compute, in topological order
+            values (list): Node values; operands of nodes must already be current
+            pinned (dict[int, int]): Node values to use as-is instead of computing them
+
+        Returns:
+            int: Number of gates evaluated (pinned nodes and literals excluded)
+        """
+        opcodes, left, right = self.opcodes, self.left, self.right
+        gates = 0
+
+        for node in nodes:
+            if node in pinned:
+                values[node] = pinned[node]
+                continue
+            opcode = opcodes[node]
+            if opcode == OP_CONST:
+                values[node] = left[node]
+                continue
+            if opcode == OP_UNDEFINED:
+                continue
+
+            gates += 1
+            a = values[left[node]]
+            value = None
+            if a is None:
+                pass
+            elif opcode == OP_ASSIGN:
+                value = a
+            elif opcode == OP_NOT:
+                value = ~a & 0xFFFF  # 16-bit NOT
+            else:
+                b = values[right[node]]
+                if b is None:
+                    pass
+                elif opcode == OP_AND:
+                    value = a & b
+                elif opcode == OP_OR:
+                    value = a | b
+                elif opcode == OP_LSHIFT:
+                    value = (a << b) & 0xFFFF  # 16-bit left shift
+                else:
+                    value = a >> b
+            values[node] = value
+
+        return gates
+
+    def evaluate_batch(self, inputs: dict[str, np.ndarray], outputs: list[str]) -> dict[str, np.ndarray]:
+        """
+        Evaluate the circuit for many input assignments at once.
+
+        Each wire holds a uint16 vector with one lane per test case, so every
+        gate runs once as a vectorized operation across all lanes. Vectors
+        are released as soon as their last reader has run.
+
+        Args:
+            inputs (dict[str, np.ndarray]): Vectors for the wires to drive, usually
+                the literal-driven source wires; all must have the same length
+            outputs (list[str]): Wires to return
+
+        Returns:
+            dict[str, np.ndarray]: A uint16 vector per requested output wire
+
+        Raises:
+            ValueError: If a wire is unknown, the vectors differ in length, or an
+                output depends on an undefined wire
+        """
+        pinned = {}
+        for wire, vector in inputs.items():
+            if wire not in self.index:
+                raise ValueError(f"Undefined wire: {wire}")
+            pinned[self.index[wire]] = np.asarray(vector, dtype=np.uint16)
+        if len({len(vector) for vector in pinned.values()}) > 1:
+            raise ValueError("All input vectors must have the same number of lanes")
+        for wire in outputs:
+            if wire not in self.index:
+                raise ValueError(f"Undefined wire: {wire}")
+
+        wanted = {self.index[wire] for wire in outputs}
+        readers = [len(fanout) for fanout in self.fanout]
+        opcodes, left, right = self.opcodes, self.left, self.right
+        values = [None] * len(self.names)
+
+        for node in self.order:
+            if node in pinned:
+                value = pinned[node]
+            elif opcodes[node] == OP_CONST:
+                value = np.uint16(left[node] & 0xFFFF)
+            elif opcodes[node] == OP_UNDEFINED:
+                value = None
+            else:
+                opcode = opcodes[node]
+                operands = self.operands(node)
+                a = values[operands[0]]
+                b = values[operands[1]] if len(operands) == 2 else None
+                if a is None or (len(operands) == 2 and b is None):
+                    value = None
+                elif opcode == OP_ASSIGN:
+                    value = a
+                elif opcode == OP_NOT:
+                    value = np.invert(a)
+                elif opcode == OP_AND:
+                    value = np.bitwise_and(a, b)
+                elif opcode == OP_OR:
+                    value = np.bitwise_or(a, b)
+                elif opcode == OP_LSHIFT:
+                    value = np.left_shift(a, b)
+                else:
+                    value = np.right_shift(a, b)
+
+                # Drop operand vectors nobody else needs
+                for operand in operands:
+                    readers[operand] -= 1
+                    if readers[operand] == 0 and operand not in wanted:
+                        values[operand] = None
+            values[node] = value
+
+        lanes = len(next(iter(pinned.values()))) if pinned else 1
+        results = {}
+        for wire in outputs:
+            node = self.index[wire]
+            if values[node] is None:
+                raise ValueError(f"Undefined wire: {self.undefined_source(node, values)}")
+            results[wire] = np.broadcast_to(values[node], (lanes,)).astype(np.uint16)
+        return results
+
+    def generate_source(self, name: str = "circuit") -> tuple[str, list[str], list[str]]:
+        """
+        Generate a straight-line Python function that evaluates the whole circuit.
+
+        Every wire becomes a local variable assigned once, in topological
+        order, and literals are inlined. Undefined wires become required
+        parameters. Literal-driven source wires become parameters that
+        default to their literal, so they can be overridden per call.
+
+        Args:
+            name (str): Name of the generated function
+
+        Returns:
+            tuple: (source, inputs, outputs) where inputs are the wire names of
+                   the parameters in order and outputs are the wire names of
+                   the returned tuple in order
+        """
+        opcodes, left = self.opcodes, self.left
+
+        def operand(node: int) -> str:
+            return str(left[node]) if opcodes[node] == OP_CONST else f"v{node}"
+
+        def is_source(node: int) -> bool:
+            return opcodes[node] == OP_ASSIGN and opcodes[left[node]] == OP_CONST
+
+        required = [node for node in self.order if opcodes[node] == OP_UNDEFINED and self.fanout[node]]
+        sources = [node for node in self.order if is_source(node)]
+        parameters = [f"v{node}" for node in required]
+        parameters += [f"v{node}={left[left[node]]}" for node in sources]
+
+        lines = [f"def {name}({', '.join(parameters)}):"]
+        outputs = []
+        for node in self.order:
+            opcode = opcodes[node]
+            if opcode in (OP_CONST, OP_UNDEFINED):
+                continue
+            outputs.append(node)
+            if is_source(node):
+                continue  # Already bound as a parameter
+            a, b = left[node], self.right[node]
+            expression = GATE_TEMPLATES[opcode].format(a=operand(a), b=operand(b) if b >= 0 else None)
+            lines.append(f"    v{node} = {expression}")
+        lines.append(f"    return ({''.join(f'v{node}, ' for node in outputs)})")
+
+        source = "\n".join(lines) + "\n"
+        names = self.names
+        return source, [names[node] for node in required + sources], [names[node] for node in outputs]
+
+    def downstream(self, node: int, stop: set = frozenset()) -> set:
+        """
+        Return every node whose value depends on node (its cone of influence).
+
+        Args:
+            node (int): The node that changed
+            stop (set): Nodes that are not entered, e.g. because they are pinned
+
+        Returns:
+            set: The downstream nodes, not including node itself
+        """
+        cone = set()
+        stack = list(self.fanout[node])
+        while stack:
+            reader = stack.pop()
+            if reader in cone or reader in stop:
+                continue
+            cone.add(reader)
+            stack.extend(self.fanout[reader])
+        return cone
+
+    def undefined_source(self, node: int, values: list) -> str:
+        """Follow unresolved operands from node back to an undefined wire and return its name."""
+        while self.opcodes[node] != OP_UNDEFINED:
+            node = next(operand for operand in self.operands(node) if values[operand] is None)
+        return self.names[node]
 
 class Circuit:
     def __init__(self, instructions: list[str]):
@@ -12,6 +361,15 @@ class Circuit:
         for instruction in instructions:
             self._parse_instruction(instruction.strip())
 
+        # Compile the gates once into an integer-indexed netlist
+        self.netlist = Netlist(self.instructions)
+
+        # Node values from the last sweep, and the nodes made stale by overrides
+        self._values = None
+        self._dirty = set()
+        self._overrides = {}
+        self.reevaluated_gates = 0  # Gates computed by the most recent evaluation
+
     def _parse_instruction(self, instruction: str):
         """Parse a single instruction and store the operation for each wire."""
         # Match patterns like: "123 -> x" or "x AND y -> z" or "NOT x -> z"
@@ -24,11 +382,13 @@ class Circuit:
         # Store the expression that produces this wire's value
         self.instructions[target_wire] = expression
 
-    @lru_cache(maxsize=None)
     def get_wire_value(self, wire: str) -> int:
         """
         Get the value of a wire, computing it if necessary.
-        Uses memoization to avoid recomputing values.
+
+        The first lookup evaluates the whole netlist in one iterative sweep
+        and stores every wire in wire_values. Values already in wire_values
+        are kept as they are, so they can be used to override wires.
         """
         # If it's already computed, return it
         if wire in self.wire_values:
@@ -44,55 +404,196 @@ class Circuit:
         if wire not in self.instructions:
             raise ValueError(f"Undefined wire: {wire}")
 
-        # Get the expression for this wire
-        expression = self.instructions[wire]
+        if self._values is None:
+            values = self._evaluate()
+        elif self._dirty:
+            values = self._evaluate_dirty()
+        else:
+            values = self._values
+        node = self.netlist.index[wire]
+        if values[node] is None:
+            raise ValueError(f"Undefined wire: {self.netlist.undefined_source(node, values)}")
+        return values[node]
+
+    def _evaluate(self) -> list:
+        """Sweep the netlist, keeping existing wire values, and store every result."""
+        netlist = self.netlist
+        pinned = {netlist.index[wire]: value for wire, value in self.wire_values.items()
+                  if wire in netlist.index}
+        values = [None] * len(netlist.names)
+        self.reevaluated_gates = netlist.evaluate_nodes(netlist.order, values, pinned)
+        for node, value in enumerate(values):
+            if value is not None and netlist.opcodes[node] != OP_CONST:
+                self.wire_values[netlist.names[node]] = value
+        self._values = values
+        self._dirty.clear()
+        return values
+
+    def _evaluate_dirty(self) -> list:
+        """Recompute only the wires invalidated by overrides since the last evaluation."""
+        netlist = self.netlist
+        nodes = sorted(self._dirty, key=netlist.rank.__getitem__)
+        self.reevaluated_gates = netlist.evaluate_nodes(nodes, self._values, self._overrides)
+        for node in nodes:
+            value = self._values[node]
+            if value is not None:
+                self.wire_values[netlist.names[node]] = value
+        self._dirty.clear()
+        return self._values
+
+    def override(self, wire: str, value: int) -> int:
+        """
+        Set a wire to a fixed value and invalidate only the wires downstream of it.
+
+        The stale wires are recomputed on the next lookup that needs them;
+        reevaluated_gates then reports how many gates that took.
 
-        # Parse and evaluate the expression
-        value = self._evaluate_expression(expression)
+        Args:
+            wire (str): The wire to override
+            value (int): Its new value
 
-        # Cache the result
+        Returns:
+            int: Number of downstream wires invalidated
+        """
         self.wire_values[wire] = value
-        return value
+        self.reevaluated_gates = 0
+        node = self.netlist.index.get(wire)
+        if node is None:
+            return 0
+        self._overrides[node] = value
+        if self._values is None:
+            return 0  # Nothing computed yet; the first sweep will use the override
 
-    def _evaluate_expression(self, expression: str) -> int:
-        """Evaluate a circuit expression."""
-        tokens = expression.split()
+        self._values[node] = value
+        cone = self.netlist.downstream(node, stop=self._overrides.keys() | self._dirty)
+        for stale in cone:
+            self.wire_values.pop(self.netlist.names[stale], None)
+        self._dirty |= cone
+        return len(cone)
 
-        if len(tokens) == 1:
-            # Direct assignment: "123" or "x"
-            return self.get_wire_value(tokens[0])
+    def evaluate_batch(self, inputs: dict[str, np.ndarray], outputs: list[str]) -> dict[str, np.ndarray]:
+        """
+        Evaluate the circuit for a batch of input assignments without building a Circuit per case.
 
-        elif len(tokens) == 2:
-            # NOT operation: "NOT x"
-            if tokens[0] != "NOT":
-                raise ValueError(f"Invalid unary operation: {expression}")
-            operand = self.get_wire_value(tokens[1])
-            return ~operand & 0xFFFF  # 16-bit NOT
+        Args:
+            inputs (dict[str, np.ndarray]): A vector of values per driven wire, one lane per case
+            outputs (list[str]): Wires to return
 
-        elif len(tokens) == 3:
-            # Binary operation: "x AND y" or "x OR y" or "x LSHIFT 2" or "x RSHIFT 2"
-            left = self.get_wire_value(tokens[0])
-            op = tokens[1]
-            right = self.get_wire_value(tokens[2])
-
-            if op == "AND":
-                return left & right
-            elif op == "OR":
-                return left | right
-            elif op == "LSHIFT":
-                return (left << right) & 0xFFFF  # 16-bit left shift
-            elif op == "RSHIFT":
-                return left >> right
-            else:
-                raise ValueError(f"Unknown operation: {op}")
+        Returns:
+            dict[str, np.ndarray]: A uint16 vector per requested output wire
+        """
+        return self.netlist.evaluate_batch(inputs, outputs)
 
-        else:
-            raise ValueError(f"Invalid expression: {expression}")
+    def source_wires(self) -> list[str]:
+        """Return the wires driven directly by a literal, e.g. "123 -> b"."""
+        netlist = self.netlist
+        return [
+            netlist.names[node] for node in range(len(netlist.names))
+            if netlist.opcodes[node] == OP_ASSIGN and netlist.opcodes[netlist.left[node]] == OP_CONST
+        ]
 
     def reset(self):
-        """Reset all computed wire values (for part 2)."""
+        """Reset all computed wire values and overrides."""
         self.wire_values.clear()
-        self.get_wire_value.cache_clear()
+        self._values = None
+        self._dirty.clear()
+        self._overrides.clear()
+
+def _load_cached_circuit(path: str):
+    """
+    Load a compiled circuit from the cache.
+
+    Args:
+        path (str): Path of the cache entry
+
+    Returns:
+        tuple: (code, inputs, outputs), or None if the entry is missing or unreadable
+    """
+    try:
+        with open(path, 'rb') as file:
+            cached = pickle.load(file)
+        return marshal.loads(cached['code']), cached['inputs'], cached['outputs']
+    except (OSError, EOFError, ValueError, KeyError, pickle.UnpicklingError):
+        return None
+
+def _store_cached_circuit(path: str, code, inputs: list[str], outputs: list[str]) -> None:
+    """
+    Write a compiled circuit to the cache, skipping the cache if it cannot be written.
+
+    The entry is written to a temporary file and renamed into place, so
+    concurrent runs never read a partial entry.
+
+    Args:
+        path (str): Path of the cache entry
+        code: The compiled module code object
+        inputs (list[str]): Parameter wires of the generated function
+        outputs (list[str]): Wires returned by the generated function
+    """
+    temporary = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(temporary, 'wb') as file:
+            pickle.dump({'code': marshal.dumps(code), 'inputs': inputs, 'outputs': outputs}, file)
+        os.replace(temporary, path)
+    except OSError:
+        # Caching is only an optimization; a read-only or full disk must not stop the run
+        try:
+            os.remove(temporary)
+        except OSError:
+            pass
+
+def compile_circuit(instructions: list[str], cache_dir: str = CIRCUIT_CACHE_DIR):
+    """
+    Compile a circuit to a straight-line Python function, caching it on disk.
+
+    The cache is keyed by a hash of the normalized instruction text and the
+    interpreter's bytecode tag, so a repeated run on the same circuit loads
+    the compiled code object without parsing or code generation.
+
+    Args:
+        instructions (list[str]): List of instruction strings
+        cache_dir (str): Directory for cached code objects, or None to disable caching
+
+    Returns:
+        callable: evaluate(**wires) -> dict[str, int], taking values for
+                  undefined wires (required) and literal-driven wires (optional)
+    """
+    text = "\n".join(line.strip() for line in instructions if line.strip())
+    key = hashlib.sha256(text.encode()).hexdigest()
+    path = os.path.join(cache_dir, f"{key}.{sys.implementation.cache_tag}.pickle") if cache_dir else None
+
+    cached = _load_cached_circuit(path) if path is not None else None
+    if cached is not None:
+        code, inputs, outputs = cached
+    else:
+        source, inputs, outputs = Circuit(instructions).netlist.generate_source()
+        code = compile(source, f"<circuit {key[:12]}>", 'exec')
+        if path is not None:
+            _store_cached_circuit(path, code, inputs, outputs)
+
+    namespace = {}
+    exec(code, namespace)
+    function = namespace['circuit']
+    positions = {wire: position for position, wire in enumerate(inputs)}
+
+    def evaluate(**wires) -> dict[str, int]:
+        unknown = set(wires) - positions.keys()
+        if unknown:
+            raise ValueError(f"Not an input wire: {sorted(unknown)[0]}")
+        defaults = function.__defaults__ or ()
+        required = len(inputs) - len(defaults)
+        arguments = []
+        for position, wire in enumerate(inputs):
+            if wire in wires:
+                arguments.append(wires[wire])
+            elif position < required:
+                raise ValueError(f"Undefined wire: {wire}")
+            else:
+                arguments.append(defaults[position - required])
+        return dict(zip(outputs, function(*arguments)))
+
+    evaluate.inputs = inputs
+    return evaluate
 
 def solve_part1(instructions: list[str]) -> int:
     """Solve part 1: find the value of wire 'a'."""
@@ -106,12 +607,8 @@ def solve_part2(instructions: list[str]) -> int:
     # Get the value of wire 'a' from part 1
     value_a = circuit.get_wire_value('a')
 
-    # Reset the circuit
-    circuit.reset()
-
-    # Override wire 'b' with the value from part 1
-    circuit.wire_values['b'] = value_a
-    circuit.get_wire_value.cache_clear()  # Clear cache since we're changing values
+    # Override wire 'b' with the value from part 1; only wires fed by 'b' are recomputed
+    circuit.override('b', value_a)
 
     # Get the new value of wire 'a'
     return circuit.get_wire_value('a')
@@ -131,6 +628,11 @@ def main():
         type=str,
         help='Use a local file instead of fetching data from adventofcode.com'
     )
+    parser.add_argument(
+        '--compiled',
+        action='store_true',
+        help='Evaluate with the generated straight-line function (cached on disk)'
+    )
     args = parser.parse_args()
 
     # Get the input data
@@ -154,7 +656,16 @@ def main():
     instructions = data.strip().split('\n')
 
     # Solve the appropriate part
-    if args.part == 1:
+    if args.compiled:
+        evaluate = compile_circuit(instructions)
+        result = evaluate()['a']
+        if args.part == 1:
+            print(f"Part 1 - Value of wire 'a': {result}")
+        elif 'b' not in evaluate.inputs:
+            print("Part 2 needs wire 'b' to be driven by a literal when using --compiled")
+        else:
+            print(f"Part 2 - New value of wire 'a': {evaluate(b=result)['a']}")
+    elif args.part == 1:
         result = solve_part1(instructions)
         print(f"Part 1 - Value of wire 'a': {result}")
     else:  # part 2
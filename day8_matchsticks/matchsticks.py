@@ -1,6 +1,14 @@
 import argparse
+import csv
+import re
+import sys
 from aocd import get_data
 
+DEFAULT_BUFFER_SIZE = 1 << 20  # Bytes read per chunk in streaming mode
+
+# One escape sequence as parsed by calculate_memory_length; never crosses a line
+ESCAPE = re.compile(rb'\\(?:x[^\n]{2}|[^\n])')
+
 def calculate_literal_length(s: str) -> int:
     """
     Calculate the length of the string as it appears in the code (literal length).
@@ -81,6 +89,163 @@ def calculate_encoded_length(s: str) -> int:
 
     return len(encoded)
 
+def measure_literals(data: bytes) -> tuple[int, int, int]:
+    """
+    Measure every string literal in a newline-separated input in bulk.
+
+    Quotes, backslashes and newlines are counted over the raw bytes; only
+    escape sequences are visited, left to right, so an escaped backslash
+    followed by "x" is not mistaken for a hex escape. The encoded length
+    is the literal length plus one per quote and backslash plus two
+    surrounding quotes, so no escaped copies are built.
+
+    Args:
+        data (bytes): The input with one string literal per line, already stripped
+
+    Returns:
+        tuple[int, int, int]: Total literal, memory and encoded lengths
+
+    Raises:
+        ValueError: The same error calculate_memory_length raises for the first invalid line
+    """
+    lone_quote = data == b'"' or data.startswith(b'"\n') or data.endswith(b'\n"') or b'\n"\n' in data
+    if not data.isascii() or lone_quote:
+        # Byte counts only equal character counts for ASCII input, and a line
+        # holding a single quote has no separate closing quote to count
+        strings = data.decode().split('\n')
+        return (sum(map(calculate_literal_length, strings)),
+                sum(map(calculate_memory_length, strings)),
+                sum(map(calculate_encoded_length, strings)))
+
+    line_count = data.count(b'\n') + 1
+    literal = len(data) - (line_count - 1)
+    encoded = literal + data.count(b'"') + data.count(b'\\') + 2 * line_count
+
+    # Every line must start and end with a quote
+    valid = (data.startswith(b'"') and data.endswith(b'"')
+             and data.count(b'"\n') == line_count - 1 and data.count(b'\n"') == line_count - 1)
+
+    simple = hexadecimal = 0
+    size = len(data)
+    if valid:
+        for match in ESCAPE.finditer(data):
+            end = match.end()
+            # An escape must not swallow the closing quote of its line
+            if end == size or data[end] == 0x0A:
+                valid = False
+                break
+            if end - match.start() == 4:
+                hexadecimal += 1
+            elif data[end - 1] in b'\\"':
+                simple += 1
+            else:
+                valid = False
+                break
+
+    if not valid:
+        # Re-scan line by line to raise the exact error for the first bad literal
+        for line in data.decode().split('\n'):
+            calculate_memory_length(line)
+
+    memory = literal - 2 * line_count - simple - 3 * hexadecimal
+    return literal, memory, encoded
+
+def _measure_block(block: bytes, position: dict, writer) -> tuple[int, int, int]:
+    """
+    Measure a block of complete lines, optionally writing one stats row per line.
+
+    Blank lines before the first literal or after the last one are skipped,
+    like the whitespace the other solvers strip from the whole input. A blank
+    line between two literals is rejected, as it is by the other solvers.
+
+    Args:
+        block (bytes): Complete lines without their final newline
+        position (dict): Stream position, updated in place: 'lines' is the
+            number of lines read so far, 'started' whether a literal has been
+            seen and 'blank' the number of the first blank line since the
+            last literal, or 0
+        writer: A csv writer for per-line stats, or None
+
+    Returns:
+        tuple[int, int, int]: Literal, memory and encoded totals for the block
+
+    Raises:
+        ValueError: If a literal is invalid or a blank line separates two literals
+    """
+    if b'\r' in block:
+        block = block.replace(b'\r', b'')
+
+    has_blank = not block or block.startswith(b'\n') or block.endswith(b'\n') or b'\n\n' in block
+    if writer is None and not has_blank:
+        if position['started'] and position['blank']:
+            raise ValueError(f"Blank line between string literals on line {position['blank']}")
+        position['lines'] += block.count(b'\n') + 1
+        position['started'] = True
+        return measure_literals(block)
+
+    totals = [0, 0, 0]
+    for line in block.split(b'\n'):
+        position['lines'] += 1
+        if not line:
+            if position['started'] and not position['blank']:
+                position['blank'] = position['lines']
+            continue
+        if position['started'] and position['blank']:
+            raise ValueError(f"Blank line between string literals on line {position['blank']}")
+        position['started'] = True
+        lengths = measure_literals(line)
+        for index, length in enumerate(lengths):
+            totals[index] += length
+        if writer is not None:
+            writer.writerow((position['lines'], *lengths))
+    return tuple(totals)
+
+def stream_literal_stats(stream, buffer_size: int = DEFAULT_BUFFER_SIZE, stats_file=None) -> tuple[int, int, int]:
+    """
+    Measure literal, memory and encoded lengths together in one streaming pass.
+
+    The stream is read in fixed-size chunks and only the partial line at the
+    end of each chunk is carried over, so memory use is bounded by the buffer
+    size and the longest line.
+
+    Args:
+        stream: A binary file-like object (e.g. an open file or sys.stdin.buffer)
+        buffer_size (int): Number of bytes read per chunk
+        stats_file (optional): A text file to receive per-line CSV stats with
+            columns line, literal, memory, encoded; line is the 1-based line
+            number in the input
+
+    Returns:
+        tuple[int, int, int]: Total literal, memory and encoded lengths
+
+    Raises:
+        ValueError: If a literal is invalid or a blank line separates two literals
+    """
+    writer = None
+    if stats_file is not None:
+        writer = csv.writer(stats_file)
+        writer.writerow(('line', 'literal', 'memory', 'encoded'))
+
+    totals = [0, 0, 0]
+    position = {'lines': 0, 'started': False, 'blank': 0}
+    pending = b''
+    while True:
+        chunk = stream.read(buffer_size)
+        if chunk:
+            pending += chunk
+            cut = pending.rfind(b'\n')
+            if cut == -1:
+                continue
+            block, pending = pending[:cut], pending[cut + 1:]
+        elif pending:
+            block, pending = pending, b''
+        else:
+            break
+
+        for index, length in enumerate(_measure_block(block, position, writer)):
+            totals[index] += length
+    return tuple(totals)
+
 def solve_part1(strings: list[str]) -> int:
     """
     Solve part 1: Find the difference between literal and memory lengths.
@@ -142,8 +307,50 @@ def main():
         type=str,
         help='Use a local file instead of fetching data from adventofcode.com'
     )
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help="Measure both parts in one buffered pass over --use-file, or stdin if it is '-'"
+    )
+    parser.add_argument(
+        '--buffer-size',
+        type=int,
+        default=DEFAULT_BUFFER_SIZE,
+        help=f'Bytes per read in streaming mode (default: {DEFAULT_BUFFER_SIZE})'
+    )
+    parser.add_argument(
+        '--stats',
+        type=str,
+        help='With --stream, write per-line literal/memory/encoded lengths to this CSV file'
+    )
+    parser.add_argument(
+        '--bulk',
+        action='store_true',
+        help='Measure all literals in one pass over the raw bytes'
+    )
     args = parser.parse_args()
 
+    if args.stream:
+        if not args.use_file:
+            print("--stream requires --use-file (use '-' for stdin)")
+            return
+        stats_file = open(args.stats, 'w', newline='') if args.stats else None
+        try:
+            if args.use_file == '-':
+                literal, memory, encoded = stream_literal_stats(sys.stdin.buffer, args.buffer_size, stats_file)
+            else:
+                with open(args.use_file, 'rb') as file:
+                    literal, memory, encoded = stream_literal_stats(file, args.buffer_size, stats_file)
+        except FileNotFoundError:
+            print(f"Input file not found: {args.use_file}")
+            return
+        finally:
+            if stats_file is not None:
+                stats_file.close()
+        print(f"Part 1 - Total difference: {literal - memory}")
+        print(f"Part 2 - Total difference: {encoded - literal}")
+        return
+
     # Get the input data
     if args.use_file:
         try:
@@ -161,6 +368,14 @@ def main():
             print("You can also use --use-file to read from a local file.")
             return
 
+    if args.bulk:
+        literal, memory, encoded = measure_literals(data.strip().encode())
+        if args.part == 1:
+            print(f"Part 1 - Total difference: {literal - memory}")
+        else:
+            print(f"Part 2 - Total difference: {encoded - literal}")
+        return
+
     # Split into strings (each line is a string literal)
     strings = data.strip().split('\n')
 
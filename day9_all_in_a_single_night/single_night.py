@@ -1,8 +1,26 @@
 import argparse
+import math
+import multiprocessing
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
 from aocd import get_data
 from itertools import permutations
 from collections import defaultdict
 
+import numpy as np
+
+NO_EDGE = -1  # Marks a missing connection in a distance matrix
+PROGRESS_INTERVAL = 1024  # Search nodes between checks of the shared bound and deadline
+MEMO_LIMIT = 1 << 22  # Entries per branch-and-bound cache in each worker
+
+# Branch-and-bound state shared through the pool initializer
+_shared_best = None
+_search_cost = None
+_search_order = None
+_tree_costs = None  # Spanning tree cost per unvisited-city bitmask
+_shortest_to = None  # Cheapest cost seen per (visited bitmask, end city, first city)
+
 def parse_distances(lines: list[str]) -> dict:
     """
     Parse the distance data into a dictionary of dictionaries.
@@ -100,6 +118,500 @@ def find_longest_route(distances: dict) -> int:
 
     return longest_distance
 
+def build_distance_matrix(distances: dict) -> tuple[list[str], np.ndarray]:
+    """
+    Convert the nested distance dictionary into an integer-indexed matrix.
+
+    Args:
+        distances (dict): Distance matrix as returned by parse_distances
+
+    Returns:
+        tuple[list[str], np.ndarray]: The city names, and an int64 matrix where
+                                      entry [i, j] is the distance between
+                                      cities i and j, or NO_EDGE if they are
+                                      not connected
+    """
+    cities = list(distances.keys())
+    index = {city: i for i, city in enumerate(cities)}
+    matrix = np.full((len(cities), len(cities)), NO_EDGE, dtype=np.int64)
+    np.fill_diagonal(matrix, 0)
+
+    for city, neighbours in distances.items():
+        for other, distance in neighbours.items():
+            matrix[index[city], index[other]] = distance
+
+    return cities, matrix
+
+def _masks_by_size(n: int) -> list[np.ndarray]:
+    """
+    Group every subset bitmask of n cities by the number of cities it holds.
+
+    Args:
+        n (int): Number of cities
+
+    Returns:
+        list[np.ndarray]: Entry k holds all masks with exactly k bits set
+    """
+    masks = np.arange(1 << n, dtype=np.int64)
+    sizes = np.zeros(1 << n, dtype=np.int8)
+    for city in range(n):
+        sizes += ((masks >> city) & 1).astype(np.int8)
+    ordered = masks[np.argsort(sizes, kind='stable')]
+    return np.split(ordered, np.cumsum(np.bincount(sizes, minlength=n + 1))[:-1])
+
+def held_karp(matrix: np.ndarray, longest: bool = False) -> tuple:
+    """
+    Find the optimal open path through every city with bitmask dynamic programming.
+
+    best[j, mask] is the cheapest path that visits exactly the cities in mask
+    and ends at j. Masks are filled one subset size at a time, and every end
+    city is vectorized over all masks of that size, which gives O(n^2 * 2^n)
+    work and O(n * 2^n) memory. The longest path is the shortest path over
+    negated distances.
+
+    Args:
+        matrix (np.ndarray): Distance matrix as returned by build_distance_matrix
+        longest (bool): Find the longest path instead of the shortest
+
+    Returns:
+        tuple: (distance, route) where route lists city indices in visiting
+               order, or (None, []) if no path visits every city
+    """
+    n = len(matrix)
+    if n == 0:
+        return 0, []
+
+    missing = matrix == NO_EDGE
+    cost = -matrix if longest else matrix.copy()
+
+    # int32 halves memory whenever no path length can come near the sentinel
+    bound = (int(np.abs(cost).max()) + 1) * n
+    dtype = np.int32 if bound < np.iinfo(np.int32).max // 8 else np.int64
+    unreachable = np.iinfo(dtype).max // 4
+    cost[missing] = unreachable
+    np.fill_diagonal(cost, unreachable)
+    cost = cost.astype(dtype)
+
+    best = np.full((n, 1 << n), unreachable, dtype=dtype)
+    for city in range(n):
+        best[city, 1 << city] = 0
+
+    for layer in _masks_by_size(n)[2:]:
+        for end in range(n):
+            masks = layer[(layer >> end) & 1 == 1]
+            candidates = (best[:, masks ^ (1 << end)] + cost[:, end, None]).min(axis=0)
+            # Capping at the sentinel keeps repeated missing edges from overflowing;
+            # paths through one only drift below it by at most bound
+            best[end, masks] = np.minimum(candidates, unreachable)
+
+    # Walk back from the best final city to recover the route
+    mask = (1 << n) - 1
+    end = int(np.argmin(best[:, mask]))
+    distance = int(best[end, mask])
+    if distance >= unreachable // 2:
+        return None, []
+
+    route = [end]
+    while mask != 1 << end:
+        previous = mask ^ (1 << end)
+        end, mask = int(np.argmin(best[:, previous] + cost[:, end])), previous
+        route.append(end)
+    route.reverse()
+
+    return (-distance if longest else distance), route
+
+def find_optimal_route(distances: dict, longest: bool = False) -> tuple:
+    """
+    Find the shortest or longest route and the cities it visits.
+
+    Args:
+        distances (dict): Distance matrix as returned by parse_distances
+        longest (bool): Find the longest route instead of the shortest
+
+    Returns:
+        tuple: (distance, route) with route as a list of city names; distance
+               is float('inf') for shortest or 0 for longest if no route exists
+    """
+    cities, matrix = build_distance_matrix(distances)
+    distance, route = held_karp(matrix, longest)
+    if distance is None:
+        return (0 if longest else float('inf')), []
+    return distance, [cities[city] for city in route]
+
+def _signed_costs(matrix: np.ndarray, longest: bool) -> list[list[float]]:
+    """
+    Convert a distance matrix into costs to minimize.
+
+    Args:
+        matrix (np.ndarray): Distance matrix as returned by build_distance_matrix
+        longest (bool): Negate distances so the longest route becomes the cheapest
+
+    Returns:
+        list[list[float]]: cost[i][j] for travelling from i to j, with math.inf
+                           for missing connections and for i == j
+    """
+    sign = -1 if longest else 1
+    return [
+        [math.inf if i == j or distance == NO_EDGE else sign * distance
+         for j, distance in enumerate(row)]
+        for i, row in enumerate(matrix.tolist())
+    ]
+
+def _greedy_route(cost: list[list[float]], order: list[list[int]]) -> tuple:
+    """
+    Build a nearest-neighbour route from every start city and keep the cheapest.
+
+    Args:
+        cost (list[list[float]]): Costs as returned by _signed_costs
+        order (list[list[int]]): For each city, all cities sorted by cost from it
+
+    Returns:
+        tuple: (cost, route), or (math.inf, []) if every greedy walk gets stuck
+    """
+    best, best_route = math.inf, []
+    for start in range(len(cost)):
+        route, seen, length = [start], {start}, 0
+        while len(route) < len(cost):
+            end = route[-1]
+            city = next((city for city in order[end] if city not in seen), None)
+            if city is None or cost[end][city] == math.inf:
+                break
+            route.append(city)
+            seen.add(city)
+            length += cost[end][city]
+        if len(route) == len(cost) and length < best:
+            best, best_route = length, route
+    return best, best_route
+
+def _improve_route(cost: list[list[float]], route: list[int]) -> tuple:
+    """
+    Shorten an open route with 2-opt moves until no reversal helps.
+
+    Reversing route[i:j + 1] only replaces the edge entering position i and,
+    unless j is the last position, the edge leaving position j.
+
+    Args:
+        cost (list[list[float]]): Costs as returned by _signed_costs
+        route (list[int]): A complete route through every city
+
+    Returns:
+        tuple: (cost, route) of the improved route
+    """
+    route = list(route)
+    improved = True
+    while improved:
+        improved = False
+        for i in range(1, len(route) - 1):
+            for j in range(i + 1, len(route)):
+                before, first, last = route[i - 1], route[i], route[j]
+                delta = cost[before][last] - cost[before][first]
+                if j + 1 < len(route):
+                    after = route[j + 1]
+                    delta += cost[first][after] - cost[last][after]
+                if delta < 0:
+                    route[i:j + 1] = reversed(route[i:j + 1])
+                    improved = True
+    return sum(cost[a][b] for a, b in zip(route, route[1:])), route
+
+def _spanning_tree_cost(cost: list[list[float]], cities: list[int]) -> float:
+    """
+    Compute the minimum spanning tree cost over a set of cities with Prim's algorithm.
+
+    Args:
+        cost (list[list[float]]): Costs as returned by _signed_costs
+        cities (list[int]): The cities to span
+
+    Returns:
+        float: The spanning tree cost, or math.inf if the cities are disconnected
+    """
+    first, *rest = cities
+    reach = {city: cost[first][city] for city in rest}
+    total = 0
+    while reach:
+        city = min(reach, key=reach.get)
+        step = reach.pop(city)
+        if step == math.inf:
+            return math.inf
+        total += step
+        row = cost[city]
+        for other in reach:
+            if row[other] < reach[other]:
+                reach[other] = row[other]
+    return total
+
+def _remaining_bound(end: int, unvisited: int) -> float:
+    """
+    Lower-bound the cost of finishing a route from end through the unvisited cities.
+
+    The rest of the route is one edge from end into the unvisited cities
+    followed by a path through all of them, and that path is a spanning tree
+    of the unvisited cities. Spanning trees only depend on the unvisited set,
+    so they are cached by its bitmask.
+
+    Args:
+        end (int): The city the route currently ends at
+        unvisited (int): Bitmask of the cities still to visit
+
+    Returns:
+        float: The bound, or math.inf if the route cannot be finished
+    """
+    if not unvisited:
+        return 0
+    tree = _tree_costs.get(unvisited)
+    if tree is None:
+        cities = [city for city in range(len(_search_cost)) if unvisited >> city & 1]
+        tree = _spanning_tree_cost(_search_cost, cities)
+        if len(_tree_costs) < MEMO_LIMIT:
+            _tree_costs[unvisited] = tree
+    for city in _search_order[end]:
+        if unvisited >> city & 1:
+            return _search_cost[end][city] + tree
+    return math.inf
+
+def _init_search_worker(shared_best, cost: list[list[float]], order: list[list[int]]) -> None:
+    """
+    Stores the shared best cost and the cost tables in a worker process, and clears its caches.
+    """
+    global _shared_best, _search_cost, _search_order, _tree_costs, _shortest_to
+    _shared_best, _search_cost, _search_order = shared_best, cost, order
+    _tree_costs, _shortest_to = {}, {}
+
+def _search_subtree(task: tuple) -> tuple:
+    """
+    Search every route that starts with a fixed pair of cities, depth first.
+
+    A branch is pruned when its cost so far plus a lower bound on the rest
+    cannot beat the best route found by any worker. The cheap bound adds each
+    unvisited city's cheapest edge and is maintained incrementally; branches
+    that survive it are checked against _remaining_bound. A branch is also
+    dropped when the same cities were already visited, ending at the same
+    city, at no greater cost. Routes are only completed when the last city
+    has a higher index than the first, so each route is searched in one
+    direction only.
+
+    Args:
+        task (tuple): (first, second, deadline) with deadline in time.time() seconds
+
+    Returns:
+        tuple: (cost, route, complete, bound) where cost and route are the best
+               route improving on the shared best (or math.inf and []),
+               complete is False if the deadline cut the search short, and
+               bound is a lower bound on every route in the subtree
+    """
+    first, second, deadline = task
+    cost, order = _search_cost, _search_order
+    n = len(cost)
+    cheapest = [min(row) for row in cost]
+    everything = (1 << n) - 1
+
+    visited = (1 << first) | (1 << second)
+    remaining = sum(cheapest[city] for city in range(n) if not visited >> city & 1)
+    bound = cost[first][second] + max(remaining, _remaining_bound(second, everything ^ visited))
+    if bound == math.inf:
+        return math.inf, [], True, math.inf
+
+    incumbent = _shared_best.value
+    found, found_route = math.inf, []
+    route = [first, second]
+    state = {'nodes': 0, 'timed_out': time.time() > deadline}
+    above = sum(1 for city in range(first + 1, n) if city != second)
+    shortest_to = _shortest_to
+
+    def dive(end: int, length: float, remaining: float, visited: int) -> None:
+        nonlocal incumbent, found, found_route, above
+        if visited == everything:
+            if end > first and length < incumbent:
+                found, found_route = length, list(route)
+                with _shared_best.get_lock():
+                    if length < _shared_best.value:
+                        _shared_best.value = length
+                incumbent = min(incumbent, length)
+            return
+
+        state['nodes'] += 1
+        if state['nodes'] % PROGRESS_INTERVAL == 0:
+            incumbent = min(incumbent, _shared_best.value)
+            state['timed_out'] = time.time() > deadline
+        if state['timed_out'] or not above or length + remaining >= incumbent:
+            return
+
+        # Completions depend only on the visited set, the end city and the first city
+        key = (visited * n + end) * n + first
+        previous = shortest_to.get(key)
+        if previous is not None and previous <= length:
+            return
+        if previous is not None or len(shortest_to) < MEMO_LIMIT:
+            shortest_to[key] = length
+        if length + _remaining_bound(end, everything ^ visited) >= incumbent:
+            return
+
+        for city in order[end]:
+            step = cost[end][city]
+            if step == math.inf:
+                break  # Neighbours are sorted, so the rest are unreachable too
+            if visited >> city & 1 or length + step + remaining - cheapest[city] >= incumbent:
+                continue
+            above -= city > first
+            route.append(city)
+            dive(city, length + step, remaining - cheapest[city], visited | 1 << city)
+            route.pop()
+            above += city > first
+
+    dive(second, cost[first][second], remaining, visited)
+    return found, found_route, not state['timed_out'], bound
+
+def branch_and_bound(matrix: np.ndarray, longest: bool = False, workers: int = 0,
+                     time_limit: float = None) -> dict:
+    """
+    Find the optimal open path with a parallel branch-and-bound search.
+
+    The search is seeded with the best nearest-neighbour route, improved by
+    2-opt, then split into one subtree per ordered pair of starting cities.
+    Subtrees are searched in a process pool and share the best cost found so
+    far, so a good route found by one worker immediately tightens pruning in
+    all the others. Each worker caches spanning-tree bounds and the cheapest
+    cost seen per visited set and end city, up to MEMO_LIMIT entries each.
+
+    Args:
+        matrix (np.ndarray): Distance matrix as returned by build_distance_matrix
+        longest (bool): Find the longest path instead of the shortest
+        workers (int): Number of worker processes; 0 searches in-process
+        time_limit (float, optional): Seconds to search before returning the
+            best route found so far
+
+    Returns:
+        dict: 'distance' and 'route' (city indices) of the best route found, or
+              None and [] if there is none; 'optimal' tells whether the search
+              finished; 'bound' is the best possible distance given what was
+              left unexplored and 'gap' its distance from the route found
+    """
+    n = len(matrix)
+    if n < 2:
+        return {'distance': 0, 'route': list(range(n)), 'optimal': True, 'bound': 0, 'gap': 0}
+
+    cost = _signed_costs(matrix, longest)
+    order = [sorted(range(n), key=row.__getitem__) for row in cost]
+    best, best_route = _greedy_route(cost, order)
+    if best_route:
+        best, best_route = _improve_route(cost, best_route)
+
+    deadline = time.time() + time_limit if time_limit is not None else math.inf
+    # Keep each first city's subtrees together so they share cached states,
+    # cheapest opening edge first
+    tasks = sorted(
+        ((first, second, deadline) for first in range(n) for second in range(n)
+         if cost[first][second] != math.inf),
+        key=lambda task: (task[0], cost[task[0]][task[1]])
+    )
+    shared_best = multiprocessing.Value('d', best)
+
+    if workers:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_search_worker,
+                                 initargs=(shared_best, cost, order)) as pool:
+            results = list(pool.map(_search_subtree, tasks))
+    else:
+        _init_search_worker(shared_best, cost, order)
+        results = [_search_subtree(task) for task in tasks]
+
+    bound = best
+    for found, found_route, complete, subtree_bound in results:
+        if found < best:
+            best, best_route = found, found_route
+        if not complete:
+            bound = min(bound, subtree_bound)
+    bound = min(bound, best)
+
+    if best == math.inf:
+        return {'distance': None, 'route': [], 'optimal': bound == math.inf, 'bound': None, 'gap': None}
+
+    sign = -1 if longest else 1
+    return {
+        'distance': sign * best,
+        'route': best_route,
+        'optimal': bound == best,
+        'bound': sign * bound,
+        'gap': best - bound,
+    }
+
+def find_route_branch_and_bound(distances: dict, longest: bool = False, workers: int = 0,
+                                time_limit: float = None) -> dict:
+    """
+    Find the shortest or longest route with branch-and-bound, naming its cities.
+
+    Args:
+        distances (dict): Distance matrix as returned by parse_distances
+        longest (bool): Find the longest route instead of the shortest
+        workers (int): Number of worker processes; 0 searches in-process
+        time_limit (float, optional): Seconds to search before giving up on optimality
+
+    Returns:
+        dict: As returned by branch_and_bound, with the route as city names
+    """
+    cities, matrix = build_distance_matrix(distances)
+    result = branch_and_bound(matrix, longest, workers, time_limit)
+    result['route'] = [cities[city] for city in result['route']]
+    return result
+
+def random_distances(count: int, seed: int = 0, max_distance: int = 150) -> dict:
+    """
+    Generate a complete graph with random distances in parse_distances form.
+
+    Args:
+        count (int): Number of cities
+        seed (int): Random seed
+        max_distance (int): Largest possible distance
+
+    Returns:
+        dict: Distance matrix as {city1: {city2: distance, ...}, ...}
+    """
+    rng = random.Random(seed)
+    cities = [f"City{i}" for i in range(count)]
+    distances = defaultdict(dict)
+    for i, city1 in enumerate(cities):
+        for city2 in cities[i + 1:]:
+            distance = rng.randint(1, max_distance)
+            distances[city1][city2] = distance
+            distances[city2][city1] = distance
+    return distances
+
+def benchmark(max_cities: int = 20, check_limit: int = 8) -> list[dict]:
+    """
+    Time the Held-Karp solver on random complete graphs of growing size.
+
+    Graphs with at most check_limit cities are also solved with the
+    permutation search to confirm both engines agree.
+
+    Args:
+        max_cities (int): Largest number of cities to time
+        check_limit (int): Largest number of cities cross-checked by permutations
+
+    Returns:
+        list[dict]: One entry per size with 'cities', 'shortest' and 'longest'
+                    distances, and 'seconds' spent on both searches
+
+    Raises:
+        RuntimeError: If a cross-checked graph gets different distances from the two engines
+    """
+    results = []
+    for count in range(4, max_cities + 1, 2):
+        distances = random_distances(count, seed=count)
+
+        began = time.perf_counter()
+        shortest, _ = find_optimal_route(distances)
+        longest, _ = find_optimal_route(distances, longest=True)
+        seconds = time.perf_counter() - began
+
+        if count <= check_limit:
+            expected = find_shortest_route(distances), find_longest_route(distances)
+            if (shortest, longest) != expected:
+                raise RuntimeError(
+                    f"Held-Karp disagrees with the permutation search on {count} cities: "
+                    f"shortest {shortest} vs {expected[0]}, longest {longest} vs {expected[1]}"
+                )
+
+        results.append({'cities': count, 'shortest': shortest, 'longest': longest, 'seconds': seconds})
+    return results
+
 def main():
     # Parse command-line arguments
     parser = argparse.ArgumentParser(description="Advent of Code 2015 - Day 9: All in a Single Night")
@@ -115,8 +627,37 @@ def main():
         type=str,
         help='Use a local file instead of fetching data from adventofcode.com'
     )
+    parser.add_argument(
+        '--engine',
+        choices=['permutations', 'held-karp', 'branch-and-bound'],
+        default='permutations',
+        help='Route search to use (default: permutations)'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=0,
+        help='Worker processes for branch-and-bound (default: 0, run in-process)'
+    )
+    parser.add_argument(
+        '--time-limit',
+        type=float,
+        help='Seconds branch-and-bound may search before reporting its best route so far'
+    )
+    parser.add_argument(
+        '--benchmark',
+        type=int,
+        metavar='CITIES',
+        help='Time the Held-Karp engine on random graphs of up to CITIES cities'
+    )
     args = parser.parse_args()
 
+    if args.benchmark:
+        for result in benchmark(args.benchmark):
+            print(f"{result['cities']:>3} cities: shortest {result['shortest']}, "
+                  f"longest {result['longest']} in {result['seconds']:.3f}s")
+        return
+
     # Get the input data
     if args.use_file:
         try:
@@ -151,7 +692,19 @@ def main():
     print(f"Found {len(distances)} cities")
 
     # Solve the appropriate part
-    if args.part == 1:
+    if args.engine == 'held-karp':
+        result, route = find_optimal_route(distances, longest=args.part == 2)
+        label = "Shortest" if args.part == 1 else "Longest"
+        print(f"Part {args.part} - {label} route distance: {result}")
+        print(f"Route: {' -> '.join(route)}")
+    elif args.engine == 'branch-and-bound':
+        result = find_route_branch_and_bound(distances, args.part == 2, args.workers, args.time_limit)
+        label = "Shortest" if args.part == 1 else "Longest"
+        print(f"Part {args.part} - {label} route distance: {result['distance']}")
+        print(f"Route: {' -> '.join(result['route'])}")
+        if not result['optimal'] and result['distance'] is not None:
+            print(f"Time limit reached; best possible is {result['bound']} (gap {result['gap']})")
+    elif args.part == 1:
         result = find_shortest_route(distances)
         print(f"Part 1 - Shortest route distance: {result}")
     else:  # part 2